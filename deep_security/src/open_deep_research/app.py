@@ -0,0 +1,36 @@
+"""Custom HTTP app mounted by the LangGraph server for startup and shutdown hooks."""
+
+import logging
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+
+from open_deep_research.firestore_cache import (
+    close_firestore,
+    schedule_firestore_warmup,
+)
+from open_deep_research.utils import close_http_session
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    """Warm the Firestore client on startup and release shared clients on shutdown.
+
+    The warm-up runs in the background, so the server starts accepting runs while
+    credentials load. close_firestore() first drains the background report and tool
+    cache saves, then flushes the write queue, so no cached result is lost on shutdown.
+    """
+    schedule_firestore_warmup()
+    yield
+    try:
+        await close_firestore()
+    finally:
+        await close_http_session()
+        logger.info("Closed shared Firestore and HTTP clients")
+
+
+# Registered under "http.app" in langgraph.json; it adds no routes of its own
+app = Starlette(lifespan=lifespan)
@@ -39,9 +39,10 @@ from open_deep_research.state import (
     ResearchQuestion,
     SupervisorState,
 )
-from open_deep_research.tools import think_tool
+from open_deep_research.tools import run_tools_parallel, think_tool
 from open_deep_research.utils import (
     anthropic_websearch_called,
+    drop_none_values,
     get_all_tools,
     get_api_key_for_model,
     get_model_token_limit,
@@ -439,15 +440,6 @@ async def researcher(state: ResearcherState, config: RunnableConfig) -> Command[
         }
     )
 
-# Tool Execution Helper Function
-async def execute_tool_safely(tool, args, config):
-    """Safely execute a tool with error handling."""
-    try:
-        return await tool.ainvoke(args, config)
-    except Exception as e:
-        return f"Error executing tool: {str(e)}"
-
-
 async def researcher_tools(state: ResearcherState, config: RunnableConfig) -> Command[Literal["researcher", "compress_research"]]:
     """Execute tools called by the researcher, including search tools and strategic thinking.
 
@@ -488,11 +480,10 @@ async def researcher_tools(state: ResearcherState, config: RunnableConfig) -> Co
 
     # Execute all tool calls in parallel
     tool_calls = most_recent_message.tool_calls
-    tool_execution_tasks = [
-        execute_tool_safely(tools_by_name[tool_call["name"]], tool_call["args"], config)
-        for tool_call in tool_calls
-    ]
-    observations = await asyncio.gather(*tool_execution_tasks)
+    observations = await run_tools_parallel(
+        [(tools_by_name[tool_call["name"]], tool_call["args"]) for tool_call in tool_calls],
+        config
+    )
 
     # Create tool messages from execution results
     tool_outputs = [
@@ -631,11 +622,12 @@ async def final_report_generation(state: AgentState, config: RunnableConfig):
         config: Runtime configuration with model settings and API keys
 
     Returns:
-        Dictionary containing the structured report and cleared state
+        Dictionary containing the structured report and cleared state; notes and
+        raw_notes are reset since nothing reads them after the report is written
     """
     # Step 1: Import the structured output schema
     from open_deep_research.state import SecurityAssessmentReport
-    from open_deep_research.firestore_cache import save_to_cache
+    from open_deep_research.firestore_cache import save_to_cache_async
     import json
     import logging
 
@@ -690,13 +682,15 @@ async def final_report_generation(state: AgentState, config: RunnableConfig):
             report_json = structured_report.model_dump_json(indent=2)
 
             # Also store as dict for easy access
-            report_dict = structured_report.model_dump()
+            report_dict = structured_report.model_dump(mode="json")
 
             # Save to Firestore cache if original_query is available
             original_query = state.get("original_query")
             if original_query:
                 try:
-                    await save_to_cache(original_query, report_dict)
+                    # Firestore only needs the fields that are set, so reuse the dump without
+                    # None values; the save runs in the background so the report is returned immediately
+                    save_to_cache_async(original_query, drop_none_values(report_dict))
                 except Exception as e:
                     # Log error but don't fail the request
                     logger.error(f"Failed to cache report for query '{original_query}': {e}")
@@ -711,7 +705,8 @@ async def final_report_generation(state: AgentState, config: RunnableConfig):
                     f"(Confidence: {structured_report.trust_score.confidence}, "
                     f"Sources: {len(structured_report.sources)})"
                 )],
-                "notes": {"type": "override", "value": []}
+                "notes": {"type": "override", "value": []},
+                "raw_notes": {"type": "override", "value": []}
             }
 
         except Exception as e:
@@ -744,14 +739,16 @@ async def final_report_generation(state: AgentState, config: RunnableConfig):
                 return {
                     "final_report": json.dumps({"error": str(e)}),
                     "messages": [AIMessage(content=f"Error generating assessment: {str(e)}")],
-                    "notes": {"type": "override", "value": []}
+                    "notes": {"type": "override", "value": []},
+                    "raw_notes": {"type": "override", "value": []}
                 }
 
     # All retries exhausted
     return {
         "final_report": json.dumps({"error": "Maximum retries exceeded"}),
         "messages": [AIMessage(content="Assessment generation failed after maximum retries")],
-        "notes": {"type": "override", "value": []}
+        "notes": {"type": "override", "value": []},
+        "raw_notes": {"type": "override", "value": []}
     }
 
 # Main Deep Researcher Graph Construction
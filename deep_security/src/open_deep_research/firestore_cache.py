@@ -1,24 +1,140 @@
 """Firestore cache for storing completed deep research reports."""
 
 import asyncio
+import hashlib
 import logging
 import os
-from datetime import datetime
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import firebase_admin
-from firebase_admin import credentials, firestore
+import orjson
+
+# firebase_admin pulls in gRPC, protobuf, and the Google auth stack, so it is
+# imported on first use rather than when tools that may never cache load this module
+if TYPE_CHECKING:
+    from google.api_core.retry import Retry
+    from google.cloud.firestore import Client
 
 # Initialize logging
 logger = logging.getLogger(__name__)
 
+_UTC = timezone.utc
+
 # Initialize Firebase Admin SDK
-_db: Optional[firestore.Client] = None
-_initialization_lock = asyncio.Lock()
+# _db is the single process-wide Firestore client. It owns one gRPC channel that
+# multiplexes concurrent reads and writes, so every caller must go through
+# _initialize_firebase() rather than constructing its own client.
+_db: Optional["Client"] = None
+# Set once initialization has failed (e.g. no credentials), so deployments without
+# Firebase skip the cache on every later call instead of retrying the setup
+_firebase_unavailable = False
+_initialization_lock: Optional[asyncio.Lock] = None
+_warmup_task: Optional[asyncio.Task] = None
+
+# Write coalescing: concurrent saves are queued and committed together
+_WRITE_BATCH_SIZE = 50
+_WRITE_FLUSH_INTERVAL = 0.1  # seconds to wait for more writes before committing
+_write_queue: Optional[asyncio.Queue] = None
+_writer_task: Optional[asyncio.Task] = None
+
+# Detached report saves started by save_to_cache_async; holding a reference
+# keeps them from being garbage collected before they finish
+_PENDING_SAVE_TIMEOUT = 10.0  # seconds drain_pending() waits by default
+_pending_saves: set[asyncio.Task] = set()
+
+
+class _TTLCache:
+    """Small in-process LRU cache whose entries expire after a fixed TTL."""
+
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached value for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: dict) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+# Local read-through cache in front of the "cache" collection, so repeated
+# lookups of the same query within a run skip the Firestore round trip
+_READ_CACHE = _TTLCache(ttl=60.0, maxsize=1024)
+
+# Local caches in front of the tool result collections (e.g. "cve_cache"), keyed by collection
+_DOCUMENT_CACHES: dict[str, _TTLCache] = {}
+
+
+def _doc_id(query: str) -> str:
+    """Map a query or tool cache key to its Firestore document ID.
+
+    Queries are normalized to lowercase without surrounding whitespace. Keys
+    Firestore would reject (over the ID size limit, containing "/", "." or
+    "..", or reserved __name__ form) are replaced by their SHA-1 hex digest,
+    so save and lookup always agree on the same document.
 
+    Args:
+        query: The original query string
 
-def _initialize_firebase_sync() -> Optional[firestore.Client]:
+    Returns:
+        Document ID to use for the query
+    """
+    key = query.lower().strip()
+    if (
+        key
+        and len(key.encode()) < 500
+        and "/" not in key
+        and key not in (".", "..")
+        and not (key.startswith("__") and key.endswith("__"))
+    ):
+        return key
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def _utc_timestamp() -> str:
+    """Return the current UTC time as an ISO 8601 string with a Z suffix."""
+    return datetime.now(_UTC).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+@lru_cache(maxsize=1)
+def _get_commit_retry() -> "Retry":
+    """Build the retry policy for batch commits on transient Firestore errors."""
+    from google.api_core import exceptions as google_exceptions
+    from google.api_core import retry as google_retry
+
+    return google_retry.Retry(
+        predicate=google_retry.if_exception_type(
+            google_exceptions.Aborted,
+            google_exceptions.DeadlineExceeded,
+            google_exceptions.InternalServerError,
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.TooManyRequests,
+        ),
+        initial=0.1,
+        maximum=5.0,
+        timeout=30.0,
+    )
+
+
+def _initialize_firebase_sync() -> Optional["Client"]:
     """Synchronous Firebase initialization helper.
 
     This function contains the blocking I/O operations and should only
@@ -30,6 +146,9 @@ def _initialize_firebase_sync() -> Optional[firestore.Client]:
     global _db
 
     try:
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+
         # Initialize the Firebase app if not already initialized
         if not firebase_admin._apps:
             # Try to get credentials from environment variable first
@@ -68,35 +187,266 @@ def _initialize_firebase_sync() -> Optional[firestore.Client]:
         return None
 
 
-async def _initialize_firebase() -> Optional[firestore.Client]:
+async def _initialize_firebase() -> Optional["Client"]:
     """Initialize Firebase Admin SDK with service account credentials (async).
 
     Uses asyncio.to_thread() to run blocking I/O operations in a separate thread,
-    which is required for LangGraph's async environment.
+    which is required for LangGraph's async environment. Initialization is
+    attempted once; if it fails, later calls return None immediately.
+
+    The module-level client is read once into a local, so the steady-state
+    path is a single load and never touches the lock.
 
     Returns:
         Firestore client instance or None if initialization fails.
     """
-    global _db
+    global _db, _initialization_lock, _firebase_unavailable
 
-    # Return cached client if already initialized
-    if _db is not None:
-        return _db
+    # Fast path: return cached client (or the remembered failure) without acquiring the lock
+    db = _db
+    if db is not None or _firebase_unavailable:
+        return db
+
+    # Create the lock on first use so importing this module needs no event loop
+    if _initialization_lock is None:
+        _initialization_lock = asyncio.Lock()
 
     # Use a lock to prevent multiple concurrent initializations
     async with _initialization_lock:
         # Check again after acquiring lock
-        if _db is not None:
-            return _db
+        db = _db
+        if db is None and not _firebase_unavailable:
+            # Run the blocking initialization in a separate thread
+            db = await asyncio.to_thread(_initialize_firebase_sync)
+            _db = db
+            _firebase_unavailable = db is None
+        return db
 
-        # Run the blocking initialization in a separate thread
-        _db = await asyncio.to_thread(_initialize_firebase_sync)
-        return _db
+
+async def warm_firestore() -> bool:
+    """Initialize the shared Firestore client ahead of the first cache access.
+
+    Returns:
+        True if the client is available, False otherwise
+    """
+    return await _initialize_firebase() is not None
+
+
+def schedule_firestore_warmup() -> None:
+    """Start warm_firestore() in the background if the client is not ready yet.
+
+    Lets credential loading and client construction overlap with other work
+    instead of landing on the first cache read or write. Called once on
+    startup by the server lifespan in app.py.
+    """
+    global _warmup_task
+
+    if _db is None and not _firebase_unavailable and (_warmup_task is None or _warmup_task.done()):
+        _warmup_task = asyncio.get_running_loop().create_task(warm_firestore())
+
+
+async def close_firestore() -> None:
+    """Flush pending cache writes and release the shared Firestore client.
+
+    Called once on shutdown by the server lifespan in app.py.
+    """
+    global _db, _writer_task
+
+    await drain_pending()
+
+    if _write_queue is not None and _writer_task is not None and not _writer_task.done():
+        await _write_queue.join()
+        _writer_task.cancel()
+        _writer_task = None
+
+    db = _db
+    if db is None:
+        return
+    _db = None
+
+    try:
+        # Client.close() only releases the HTTP session; the gRPC channel
+        # lives on the transport created with the first RPC
+        transport = getattr(db, "_transport", None)
+        if transport is not None:
+            await asyncio.to_thread(transport.close)
+        await asyncio.to_thread(db.close)
+    except Exception as e:
+        logger.warning(f"Failed to close Firestore client cleanly: {e}")
+
+
+def _get_write_queue() -> asyncio.Queue:
+    """Return the write queue, starting the background batch writer if needed.
+
+    The writer task is bound to the running event loop, so it is restarted
+    if it has finished or belongs to a loop that is no longer in use.
+
+    Returns:
+        The queue consumed by the background batch writer.
+    """
+    global _write_queue, _writer_task
+
+    loop = asyncio.get_running_loop()
+    if _writer_task is None or _writer_task.done() or _writer_task.get_loop() is not loop:
+        _write_queue = asyncio.Queue()
+        _writer_task = loop.create_task(_batch_writer(_write_queue))
+    return _write_queue
+
+
+async def _batch_writer(queue: asyncio.Queue) -> None:
+    """Drain queued cache writes and commit them in batches.
+
+    Waits for the first pending write, then collects further writes until
+    either _WRITE_BATCH_SIZE items have accrued or _WRITE_FLUSH_INTERVAL
+    has elapsed, and commits them as a single Firestore batch.
+
+    Args:
+        queue: Queue of (doc_ref, data, merge, future) tuples
+    """
+    loop = asyncio.get_running_loop()
+
+    while True:
+        pending = [await queue.get()]
+        deadline = loop.time() + _WRITE_FLUSH_INTERVAL
+
+        while len(pending) < _WRITE_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                pending.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        await _commit_batch(pending)
+        for _ in pending:
+            queue.task_done()
+
+
+async def _commit_batch(pending: list) -> None:
+    """Commit a batch of cache writes and resolve their futures.
+
+    Args:
+        pending: List of (doc_ref, data, merge, future) tuples to write
+    """
+    try:
+        db = await _initialize_firebase()
+        batch = db.batch()
+        for doc_ref, data, merge, _ in pending:
+            batch.set(doc_ref, data, merge=merge)
+
+        # Run the blocking Firestore commit in a separate thread
+        await asyncio.to_thread(batch.commit, retry=_get_commit_retry())
+        logger.info(f"Committed {len(pending)} cached report(s) to Firestore")
+
+    except Exception as e:
+        for *_, future in pending:
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    for *_, future in pending:
+        if not future.done():
+            future.set_result(True)
+
+
+async def _write(doc_ref, data: dict, merge: bool = False) -> None:
+    """Queue a document write for the background batch writer and wait for its commit.
+
+    Args:
+        doc_ref: Firestore document reference to write
+        data: Fields to write
+        merge: If True, update only the given fields instead of replacing the document
+    """
+    future = asyncio.get_running_loop().create_future()
+    _get_write_queue().put_nowait((doc_ref, data, merge, future))
+    await future
+
+
+def _content_hash(report_data: dict) -> str:
+    """Hash a report payload independently of key order."""
+    payload = orjson.dumps(report_data, option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+async def _get_cached_content_hash(key: str, doc_ref) -> Optional[str]:
+    """Return the content hash of the currently cached report, if any.
+
+    Uses the in-process cache when possible; otherwise reads only the
+    content_hash field so the report body is not transferred.
+    """
+    cached = _READ_CACHE.get(key)
+    if cached is not None:
+        return cached.get("content_hash")
+
+    try:
+        # Run the blocking Firestore read in a separate thread
+        snapshot = await asyncio.to_thread(doc_ref.get, field_paths=["content_hash"])
+        if snapshot.exists:
+            return (snapshot.to_dict() or {}).get("content_hash")
+    except Exception as e:
+        logger.warning(f"Failed to read cached content hash: {e}")
+    return None
 
 
 async def save_to_cache(query: str, report_data: dict) -> bool:
     """Save a completed research report to Firestore cache (async).
 
+    Waits for the write to be committed; use save_to_cache_async() to save
+    without blocking the caller.
+
+    Args:
+        query: The original query string (e.g., "slack") used as document ID
+        report_data: The full SecurityAssessmentReport as a dictionary
+
+    Returns:
+        True if save was successful, False otherwise
+    """
+    return await _save_to_cache_inner(query, report_data)
+
+
+def save_to_cache_async(query: str, report_data: dict) -> asyncio.Task:
+    """Save a completed research report to Firestore cache in the background.
+
+    The write is scheduled as a detached task and the caller does not wait
+    for Firestore to acknowledge it. Call drain_pending() before shutdown so
+    outstanding saves are not lost.
+
+    Args:
+        query: The original query string (e.g., "slack") used as document ID
+        report_data: The full SecurityAssessmentReport as a dictionary
+
+    Returns:
+        The task performing the save; its result is True if save was successful
+    """
+    return _track_pending(_save_to_cache_inner(query, report_data))
+
+
+def _track_pending(save) -> asyncio.Task:
+    """Run a save coroutine as a task tracked until it completes, for drain_pending()."""
+    task = asyncio.create_task(save)
+    _pending_saves.add(task)
+    task.add_done_callback(_pending_saves.discard)
+    return task
+
+
+async def drain_pending(timeout: float = _PENDING_SAVE_TIMEOUT) -> None:
+    """Wait for background saves started by save_to_cache_async() and save_cached_document_async().
+
+    Args:
+        timeout: Maximum number of seconds to wait for outstanding saves
+    """
+    if not _pending_saves:
+        return
+
+    _, still_pending = await asyncio.wait(set(_pending_saves), timeout=timeout)
+    if still_pending:
+        logger.warning(f"{len(still_pending)} cache save(s) still pending after {timeout}s")
+
+
+async def _save_to_cache_inner(query: str, report_data: dict) -> bool:
+    """Write a completed research report to the "cache" collection.
+
     Args:
         query: The original query string (e.g., "slack") used as document ID
         report_data: The full SecurityAssessmentReport as a dictionary
@@ -111,17 +461,27 @@ async def save_to_cache(query: str, report_data: dict) -> bool:
             return False
 
         # Prepare the cache document
+        content_hash = _content_hash(report_data)
         cache_doc = {
             "query": query,
             "report": report_data,
-            "cached_at": datetime.utcnow().isoformat() + "Z"
+            "content_hash": content_hash,
+            "cached_at": _utc_timestamp()
         }
 
         # Save to the "cache" collection using query as document ID
-        # Use set() to create or overwrite the document
-        # Run the blocking Firestore write in a separate thread
-        doc_ref = db.collection("cache").document(query.lower().strip())
-        await asyncio.to_thread(doc_ref.set, cache_doc)
+        # Queue a set() to create or overwrite the document; the background
+        # writer commits it together with any other concurrent saves
+        key = _doc_id(query)
+        doc_ref = db.collection("cache").document(key)
+        if await _get_cached_content_hash(key, doc_ref) == content_hash:
+            # Identical report already cached: only refresh its timestamp
+            await _write(doc_ref, {"cached_at": cache_doc["cached_at"]}, merge=True)
+        else:
+            await _write(doc_ref, cache_doc)
+
+        # Keep the local read cache consistent with what was just written
+        _READ_CACHE.set(key, cache_doc)
 
         logger.info(f"Successfully cached research report for query: {query}")
         return True
@@ -132,27 +492,40 @@ async def save_to_cache(query: str, report_data: dict) -> bool:
         return False
 
 
-async def get_from_cache(query: str) -> Optional[dict]:
+async def get_from_cache(query: str, fresh: bool = False) -> Optional[dict]:
     """Retrieve a cached research report from Firestore (async).
 
+    Recent hits are served from an in-process cache before falling back to
+    Firestore.
+
     Args:
         query: The original query string used as document ID
+        fresh: If True, bypass the in-process cache and read from Firestore
 
     Returns:
         The cached report data or None if not found/error
     """
     try:
+        key = _doc_id(query)
+        if not fresh:
+            cached = _READ_CACHE.get(key)
+            if cached is not None:
+                logger.info(f"Local cache hit for query: {query}")
+                return cached
+
         db = await _initialize_firebase()
         if db is None:
             return None
 
-        doc_ref = db.collection("cache").document(query.lower().strip())
+        doc_ref = db.collection("cache").document(key)
         # Run the blocking Firestore read in a separate thread
         doc = await asyncio.to_thread(doc_ref.get)
 
         if doc.exists:
             logger.info(f"Cache hit for query: {query}")
-            return doc.to_dict()
+            cached = doc.to_dict()
+            _READ_CACHE.set(key, cached)
+            return cached
         else:
             logger.info(f"Cache miss for query: {query}")
             return None
@@ -160,3 +533,116 @@ async def get_from_cache(query: str) -> Optional[dict]:
     except Exception as e:
         logger.error(f"Failed to retrieve from Firestore cache: {e}", exc_info=True)
         return None
+
+
+def _is_fresh(cached_doc: dict, max_age: float) -> bool:
+    """Check whether a cached document was written within the last max_age seconds."""
+    cached_at = cached_doc.get("cached_at")
+    if not cached_at:
+        return False
+    try:
+        written = datetime.fromisoformat(cached_at.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return False
+    return (datetime.now(_UTC) - written).total_seconds() < max_age
+
+
+async def get_cached_document(collection: str, key: str, max_age: float) -> Optional[dict]:
+    """Retrieve a cached tool result from Firestore if it is recent enough (async).
+
+    Recent hits are served from an in-process cache before falling back to
+    Firestore.
+
+    Args:
+        collection: Firestore collection holding the cached results (e.g. "cve_cache")
+        key: Cache key of the result, normalized through _doc_id
+        max_age: Maximum age of the cached result in seconds
+
+    Returns:
+        The cached document or None if missing, expired, or on error
+    """
+    local_cache = _DOCUMENT_CACHES.get(collection)
+    if local_cache is None:
+        # Entries are also checked against max_age below, so a later caller's
+        # shorter max_age is still honored
+        local_cache = _DOCUMENT_CACHES[collection] = _TTLCache(ttl=max_age, maxsize=1024)
+    key = _doc_id(key)
+
+    try:
+        cached = local_cache.get(key)
+        if cached is not None and _is_fresh(cached, max_age):
+            return cached
+
+        db = await _initialize_firebase()
+        if db is None:
+            return None
+
+        doc_ref = db.collection(collection).document(key)
+        # Run the blocking Firestore read in a separate thread
+        doc = await asyncio.to_thread(doc_ref.get)
+        if not doc.exists:
+            return None
+
+        cached = doc.to_dict()
+        if not _is_fresh(cached, max_age):
+            return None
+
+        local_cache.set(key, cached)
+        return cached
+
+    except Exception as e:
+        logger.error(f"Failed to retrieve from Firestore {collection}: {e}", exc_info=True)
+        return None
+
+
+async def save_cached_document(collection: str, key: str, data: dict) -> bool:
+    """Write a tool result through to the in-process cache and Firestore (async).
+
+    The in-process cache is filled even when Firestore is unavailable, so
+    repeated tool calls are still served locally.
+
+    Args:
+        collection: Firestore collection holding the cached results (e.g. "cve_cache")
+        key: Cache key of the result, normalized through _doc_id
+        data: Result fields to store; a "cached_at" timestamp is added
+
+    Returns:
+        True if save was successful, False otherwise
+    """
+    key = _doc_id(key)
+    cache_doc = {**data, "cached_at": _utc_timestamp()}
+
+    local_cache = _DOCUMENT_CACHES.get(collection)
+    if local_cache is not None:
+        local_cache.set(key, cache_doc)
+
+    try:
+        db = await _initialize_firebase()
+        if db is None:
+            return False
+
+        # Queue the write for the background batch writer
+        doc_ref = db.collection(collection).document(key)
+        await _write(doc_ref, cache_doc)
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to save to Firestore {collection}: {e}", exc_info=True)
+        return False
+
+
+def save_cached_document_async(collection: str, key: str, data: dict) -> asyncio.Task:
+    """Write a tool result through to Firestore in the background.
+
+    Tools call this so a cache write never delays their response. Like
+    save_to_cache_async(), the task is tracked until drain_pending() runs.
+
+    Args:
+        collection: Firestore collection holding the cached results (e.g. "cve_cache")
+        key: Cache key of the result, normalized through _doc_id
+        data: Result fields to store; a "cached_at" timestamp is added
+
+    Returns:
+        The task performing the save; its result is True if save was successful
+    """
+    return _track_pending(save_cached_document(collection, key, data))
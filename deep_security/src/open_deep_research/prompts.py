@@ -162,6 +162,7 @@ The user's input may be EITHER a hash OR an entity name:
    - Start security assessment directly
    - If relevant, also try to find hashes or URLs associated with the entity
    - Use virustotal_scan on discovered hashes, safe_browsing_check on URLs
+   - Use full_threat_scan to check a URL and a file hash together in one call
 
 <Security Assessment Priority>
 For security assessments of software/services, ensure researchers cover ALL of these areas:
@@ -176,10 +177,10 @@ MUST RESEARCH:
 7. Access Controls - SSO, MFA, RBAC, audit logging capabilities
 
 IF FILE HASH PROVIDED:
-- Use virustotal_scan tool to analyze the file
+- Use virustotal_scan tool to analyze the file (virustotal_scan_raw returns the same analysis as JSON)
 
 IF URL/DOMAIN PROVIDED:
-- Use safe_browsing_check to verify URL reputation
+- Use safe_browsing_check to verify URL reputation (safe_browsing_check_batch for several URLs)
 - Use observatory_scan to assess web security headers
 
 IMPORTANT SOURCE ATTRIBUTION:
@@ -1,34 +1,42 @@
 """Graph state definitions and data structures for the Deep Research agent."""
 
 import operator
+import sys
 from typing import Annotated, Optional, List, Literal
 
 from langchain_core.messages import MessageLikeRepresentation
 from langgraph.graph import MessagesState
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing_extensions import TypedDict
 
+# Structured outputs are built once from model output and never mutated afterwards
+FROZEN_MODEL_CONFIG = ConfigDict(frozen=True)
+
 
 ###################
 # Structured Outputs
 ###################
 class ConductResearch(BaseModel):
     """Call this tool to conduct research on a specific topic."""
+    model_config = FROZEN_MODEL_CONFIG
     research_topic: str = Field(
         description="The topic to research. Should be a single topic, and should be described in high detail (at least a paragraph).",
     )
 
 class ResearchComplete(BaseModel):
     """Call this tool to indicate that the research is complete."""
+    model_config = FROZEN_MODEL_CONFIG
 
 class Summary(BaseModel):
     """Research summary with key findings."""
+    model_config = FROZEN_MODEL_CONFIG
 
     summary: str
     key_excerpts: str
 
 class ClarifyWithUser(BaseModel):
     """Model for user clarification requests."""
+    model_config = FROZEN_MODEL_CONFIG
 
     need_clarification: bool = Field(
         description="Whether the user needs to be asked a clarifying question.",
@@ -42,6 +50,7 @@ class ClarifyWithUser(BaseModel):
 
 class ResearchQuestion(BaseModel):
     """Research question and brief for guiding research."""
+    model_config = FROZEN_MODEL_CONFIG
 
     research_brief: str = Field(
         description="A research question that will be used to guide the research.",
@@ -52,6 +61,7 @@ class ResearchQuestion(BaseModel):
 ###################
 class SourceAttribution(BaseModel):
     """Source citation with attribution."""
+    model_config = FROZEN_MODEL_CONFIG
     type: Literal["vendor", "independent"] = Field(
         description="Whether source is vendor-stated or independent verification"
     )
@@ -62,6 +72,7 @@ class SourceAttribution(BaseModel):
 
 class KeyStrength(BaseModel):
     """Security strength finding with source."""
+    model_config = FROZEN_MODEL_CONFIG
     title: str = Field(description="Brief title of the strength")
     description: str = Field(description="Detailed description")
     source_type: Literal["vendor", "independent"]
@@ -69,12 +80,14 @@ class KeyStrength(BaseModel):
 
 class Consideration(BaseModel):
     """Security consideration or risk."""
+    model_config = FROZEN_MODEL_CONFIG
     title: str = Field(description="Brief title of the consideration")
     description: str = Field(description="Detailed description")
     severity: Literal["low", "medium", "high", "critical"]
 
 class ComplianceCertification(BaseModel):
     """Compliance certification details."""
+    model_config = FROZEN_MODEL_CONFIG
     cert: str = Field(description="Certification name (e.g., 'SOC 2 Type II')")
     issued: str = Field(description="Issue date (YYYY-MM-DD)")
     expires: str = Field(description="Expiration date or 'Ongoing'")
@@ -84,6 +97,7 @@ class ComplianceCertification(BaseModel):
 
 class CVERecord(BaseModel):
     """CVE vulnerability record."""
+    model_config = FROZEN_MODEL_CONFIG
     id: str = Field(description="CVE identifier (e.g., 'CVE-2024-1234')")
     severity: Literal["low", "medium", "high", "critical"]
     cvss: str = Field(description="CVSS score (e.g., '7.5')")
@@ -92,8 +106,15 @@ class CVERecord(BaseModel):
     patched: Optional[str] = Field(description="Patch date if available (YYYY-MM-DD)")
     kev: bool = Field(description="Whether listed in CISA KEV catalog")
 
+    @field_validator("id")
+    @classmethod
+    def intern_id(cls, value: str) -> str:
+        """Intern CVE IDs so reports repeating the same CVE share one string."""
+        return sys.intern(value)
+
 class TrustScore(BaseModel):
     """Trust score with transparent rationale."""
+    model_config = FROZEN_MODEL_CONFIG
     score: int = Field(
         ge=0,
         le=100,
@@ -109,6 +130,7 @@ class TrustScore(BaseModel):
 
 class Alternative(BaseModel):
     """Alternative product recommendation."""
+    model_config = FROZEN_MODEL_CONFIG
     name: str = Field(description="Product name")
     score: int = Field(ge=0, le=100, description="Trust score of alternative")
     icon: str = Field(description="Emoji or icon representation")
@@ -118,6 +140,7 @@ class Alternative(BaseModel):
 
 class VendorInfo(BaseModel):
     """Vendor reputation details."""
+    model_config = FROZEN_MODEL_CONFIG
     company: str = Field(description="Parent company or ownership structure")
     market_presence: str = Field(description="Market position, customer base, establishment date")
     transparency: str = Field(description="Quality of public security documentation")
@@ -125,6 +148,7 @@ class VendorInfo(BaseModel):
 
 class EncryptionDetails(BaseModel):
     """Encryption standards and practices."""
+    model_config = FROZEN_MODEL_CONFIG
     in_transit: str = Field(description="Encryption for data in transit (e.g., 'TLS 1.3')")
     at_rest: str = Field(description="Encryption for data at rest (e.g., 'AES-256')")
     key_management: str = Field(description="Key management options (e.g., 'EKM available')")
@@ -132,6 +156,7 @@ class EncryptionDetails(BaseModel):
 
 class DataResidency(BaseModel):
     """Data location and retention details."""
+    model_config = FROZEN_MODEL_CONFIG
     primary_storage: str = Field(description="Primary data storage location")
     eu_residency: str = Field(description="EU data residency options")
     retention: str = Field(description="Data retention policies")
@@ -139,11 +164,13 @@ class DataResidency(BaseModel):
 
 class AccessControl(BaseModel):
     """Access control feature."""
+    model_config = FROZEN_MODEL_CONFIG
     feature: str = Field(description="Feature name (e.g., 'SSO/SAML')")
     plan: str = Field(description="Plan availability (e.g., 'Business+', 'All plans')")
 
 class AdminControl(BaseModel):
     """Admin control feature."""
+    model_config = FROZEN_MODEL_CONFIG
     feature: str = Field(description="Feature name (e.g., 'Audit logs')")
     plan: str = Field(description="Plan availability (e.g., 'Enterprise Grid')")
 
@@ -153,6 +180,7 @@ class SecurityAssessmentReport(BaseModel):
     This structured output is designed for WithSecure's Hack Challenge:
     'Reputation Recon: AI-Powered Software Trust Assessment'
     """
+    model_config = FROZEN_MODEL_CONFIG
 
     # === ENTITY IDENTIFICATION ===
     company_name: str = Field(description="Official company/vendor name")
@@ -246,11 +274,20 @@ class SecurityAssessmentReport(BaseModel):
 ###################
 
 def override_reducer(current_value, new_value):
-    """Reducer function that allows overriding values in state."""
+    """Reducer function that allows overriding values in state.
+
+    Lists are concatenated into a single new list, since LangGraph expects a
+    fresh object for checkpointing; empty updates return the current value as is.
+    """
     if isinstance(new_value, dict) and new_value.get("type") == "override":
         return new_value.get("value", new_value)
-    else:
-        return operator.add(current_value, new_value)
+    if current_value is None:
+        return list(new_value) if isinstance(new_value, list) else new_value
+    if isinstance(current_value, list) and isinstance(new_value, list):
+        if not new_value:
+            return current_value
+        return [*current_value, *new_value]
+    return operator.add(current_value, new_value)
 
 class AgentInputState(MessagesState):
     """InputState is only 'messages'."""
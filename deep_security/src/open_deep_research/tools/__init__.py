@@ -1,17 +1,121 @@
-"""Tools for the Deep Research agent."""
+"""Tools for the Deep Research agent.
+
+Tools are exported lazily (PEP 562), so importing this package only loads the
+tool modules that are actually used, along with their HTTP and SDK dependencies.
+"""
+
+import asyncio
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
+    from langchain_core.tools import BaseTool
+
+    from open_deep_research.tools.cve_tool import cve_search
+    from open_deep_research.tools.observatory_tool import observatory_scan
+    from open_deep_research.tools.reflection_tool import think_tool
+    from open_deep_research.tools.safe_browsing_tool import (
+        safe_browsing_check,
+        safe_browsing_check_batch,
+    )
+    from open_deep_research.tools.tavily_tool import tavily_search
+    from open_deep_research.tools.threat_scan_tool import full_threat_scan
+    from open_deep_research.tools.virustotal_tool import (
+        virustotal_scan,
+        virustotal_scan_raw,
+    )
+
+# Exported tool name -> submodule that defines it
+_TOOL_MODULES = {
+    "cve_search": "cve_tool",
+    "full_threat_scan": "threat_scan_tool",
+    "observatory_scan": "observatory_tool",
+    "think_tool": "reflection_tool",
+    "safe_browsing_check": "safe_browsing_tool",
+    "safe_browsing_check_batch": "safe_browsing_tool",
+    "tavily_search": "tavily_tool",
+    "virustotal_scan": "virustotal_tool",
+    "virustotal_scan_raw": "virustotal_tool",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import a tool's module on first access and cache the tool on the package."""
+    module_name = _TOOL_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List the package attributes, including not yet imported tools."""
+    return sorted([*globals(), *_TOOL_MODULES])
+
+
+# Upper bound on tools running at once, to avoid provider rate-limit storms
+TOOL_CONCURRENCY_LIMIT = 4
+
+# Shared by every researcher so the bound holds across concurrent research units;
+# bound to the event loop it was created on, like the shared HTTP session
+_tool_semaphore: Optional[asyncio.Semaphore] = None
+_tool_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_tool_semaphore() -> asyncio.Semaphore:
+    """Return the semaphore bounding tool calls on the running event loop."""
+    global _tool_semaphore, _tool_semaphore_loop
+
+    loop = asyncio.get_running_loop()
+    if _tool_semaphore is None or _tool_semaphore_loop is not loop:
+        _tool_semaphore = asyncio.Semaphore(TOOL_CONCURRENCY_LIMIT)
+        _tool_semaphore_loop = loop
+    return _tool_semaphore
+
+
+async def run_tools_parallel(
+    specs: List[Tuple["BaseTool", Dict[str, Any]]],
+    config: "RunnableConfig"
+) -> List[Any]:
+    """Run independent tool calls concurrently.
+
+    At most TOOL_CONCURRENCY_LIMIT tools run at once across all concurrent
+    callers. Only use this for tools without shared mutable state; all tools in this
+    package qualify. Failures are returned as error strings so one failing
+    tool does not cancel the others.
+
+    Args:
+        specs: List of (tool, args) pairs to invoke
+        config: Runtime configuration passed to every tool
+
+    Returns:
+        Tool results in the same order as specs
+    """
+    semaphore = _get_tool_semaphore()
+
+    async def run(tool: "BaseTool", args: Dict[str, Any]) -> Any:
+        async with semaphore:
+            return await tool.ainvoke(args, config)
+
+    tasks = [asyncio.create_task(run(tool, args)) for tool, args in specs]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    return [
+        f"Error executing tool: {str(result)}" if isinstance(result, BaseException) else result
+        for result in results
+    ]
 
-from open_deep_research.tools.cve_tool import cve_search
-from open_deep_research.tools.observatory_tool import observatory_scan
-from open_deep_research.tools.reflection_tool import think_tool
-from open_deep_research.tools.safe_browsing_tool import safe_browsing_check
-from open_deep_research.tools.tavily_tool import tavily_search
-from open_deep_research.tools.virustotal_tool import virustotal_scan
 
 __all__ = [
     "cve_search",
+    "full_threat_scan",
     "observatory_scan",
+    "run_tools_parallel",
     "think_tool",
     "safe_browsing_check",
+    "safe_browsing_check_batch",
     "tavily_search",
     "virustotal_scan",
+    "virustotal_scan_raw",
 ]
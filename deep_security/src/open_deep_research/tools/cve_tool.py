@@ -1,19 +1,58 @@
 """CVE Search Tool for vulnerability database queries."""
 
 import asyncio
+import hashlib
 import logging
-from typing import Annotated, List
+from itertools import islice
+from typing import Annotated, List, Optional
 
-import aiohttp
+import orjson
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import InjectedToolArg, tool
 
-from open_deep_research.utils import get_nvd_api_key
+from open_deep_research.firestore_cache import (
+    get_cached_document,
+    save_cached_document_async,
+)
+from open_deep_research.utils import (
+    REQUEST_TIMEOUT,
+    format_api_error,
+    get_http_session,
+    get_nvd_api_key,
+    request_with_retry,
+)
+
+# Initialize logging
+logger = logging.getLogger(__name__)
 
 ##########################
 # CVE API Search Tool
 ##########################
 
+NVD_CVE_API_URL = "https://services.nvd.nist.gov/rest/json/cves/2.0"
+
+# NVD allows 5 requests per rolling 30 seconds without an API key
+NVD_MAX_CONCURRENT_REQUESTS = 5
+
+# Shared across searches so concurrent tool calls stay under the NVD limit;
+# bound to the event loop it was created on, like the shared HTTP session
+_nvd_semaphore: Optional[asyncio.Semaphore] = None
+_nvd_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Error messages for the statuses NVD documents (404 names the keywords)
+NVD_ERRORS = {
+    403: "Rate limit exceeded. Please wait 30 seconds before retrying or add an NVD_API_KEY to increase rate limits.",
+}
+
+# Formatted search results are cached in Firestore; CVE data changes slowly
+CVE_CACHE_COLLECTION = "cve_cache"
+CVE_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# CVSS metric versions in order of preference
+CVSS_METRIC_KEYS = ("cvssMetricV31", "cvssMetricV30", "cvssMetricV2")
+
+CVE_ENTRY_SEPARATOR = "\n" + "-" * 80 + "\n\n"
+
 CVE_SEARCH_DESCRIPTION = (
     "Search the National Vulnerability Database (NVD) for CVE records by keywords. "
     "Useful for finding security vulnerabilities related to specific software, vendors, or technologies. "
@@ -21,6 +60,72 @@ CVE_SEARCH_DESCRIPTION = (
 )
 
 
+def _cve_cache_key(keywords: List[str], max_results: int) -> str:
+    """Build a stable cache document ID for a keyword search."""
+    normalized = " ".join(sorted(keyword.lower().strip() for keyword in keywords))
+    return hashlib.sha1(f"{normalized}|{max_results}".encode()).hexdigest()
+
+
+def _get_nvd_semaphore() -> asyncio.Semaphore:
+    """Return the semaphore bounding NVD requests on the running event loop."""
+    global _nvd_semaphore, _nvd_semaphore_loop
+
+    loop = asyncio.get_running_loop()
+    if _nvd_semaphore is None or _nvd_semaphore_loop is not loop:
+        _nvd_semaphore = asyncio.Semaphore(NVD_MAX_CONCURRENT_REQUESTS)
+        _nvd_semaphore_loop = loop
+    return _nvd_semaphore
+
+
+def _extract_cvss(metrics: dict) -> tuple:
+    """Return the (base score, severity) of the preferred CVSS metric version."""
+    get = dict.get
+    for key in CVSS_METRIC_KEYS:
+        entries = get(metrics, key)
+        if entries:
+            metric = entries[0]
+            cvss_data = get(metric, "cvssData", {})
+            # CVSS v2 reports severity on the metric rather than in cvssData
+            severity_source = metric if key == "cvssMetricV2" else cvss_data
+            return get(cvss_data, "baseScore", "N/A"), get(severity_source, "baseSeverity", "Unknown")
+    return "Not scored", "Unknown"
+
+
+async def _fetch_cves(
+    session,
+    keyword_search: str,
+    max_results: int,
+    headers: dict,
+    semaphore: asyncio.Semaphore
+):
+    """Run a single NVD keyword search.
+
+    Args:
+        session: Shared aiohttp client session
+        keyword_search: Keyword string passed as keywordSearch
+        max_results: Number of results to request
+        headers: Request headers, including the optional API key
+        semaphore: Bounds the number of concurrent NVD requests
+
+    Returns:
+        Parsed JSON response on success, or a formatted error string
+    """
+    params = {
+        "keywordSearch": keyword_search,
+        "resultsPerPage": max_results,
+        "startIndex": 0
+    }
+
+    async with semaphore:
+        status, body = await request_with_retry(session.get, NVD_CVE_API_URL, params=params, headers=headers)
+
+    if status == 200:
+        return orjson.loads(body)
+    if status == 404:
+        return f"CVE API Error: No results found for keywords: {keyword_search}"
+    return format_api_error("CVE API", status, body, NVD_ERRORS)
+
+
 @tool(description=CVE_SEARCH_DESCRIPTION)
 async def cve_search(
     keywords: List[str],
@@ -30,7 +135,9 @@ async def cve_search(
     """Search the NVD CVE database for vulnerabilities matching keywords.
 
     Args:
-        keywords: List of keywords to search for (e.g., ["Apache", "Log4j"])
+        keywords: List of keywords to search for (e.g., ["Apache", "Log4j"]); records must
+            match all of them, and if none do each keyword is searched separately and
+            the results merged
         max_results: Maximum number of CVE results to return (default: 20, max: 100)
         config: Runtime configuration for API key access
 
@@ -38,21 +145,19 @@ async def cve_search(
         Formatted string containing CVE details including IDs, descriptions, scores, and references
     """
     try:
-        # Step 1: Prepare the API request
-        base_url = "https://services.nvd.nist.gov/rest/json/cves/2.0"
-
-        # Combine keywords into search string (multiple keywords work as AND)
+        # Step 1: Prepare the search
+        # The keyword list is one NVD keywordSearch (AND semantics); if nothing matches
+        # every keyword, they are searched individually in parallel and merged below
         keyword_search = " ".join(keywords)
 
         # Limit max_results to API maximum
         max_results = min(max_results, 100)
 
-        # Prepare request parameters
-        params = {
-            "keywordSearch": keyword_search,
-            "resultsPerPage": max_results,
-            "startIndex": 0
-        }
+        # Return a recent cached result for the same search if there is one
+        cache_key = _cve_cache_key(keywords, max_results)
+        cached = await get_cached_document(CVE_CACHE_COLLECTION, cache_key, CVE_CACHE_TTL)
+        if cached and cached.get("formatted"):
+            return cached["formatted"]
 
         # Step 2: Set up headers with optional API key
         headers = {}
@@ -60,84 +165,113 @@ async def cve_search(
         if nvd_api_key:
             headers["apiKey"] = nvd_api_key
 
-        # Step 3: Execute the API request with timeout
-        timeout = aiohttp.ClientTimeout(total=60.0)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(base_url, params=params, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                elif response.status == 403:
-                    return "CVE API Error: Rate limit exceeded. Please wait 30 seconds before retrying or add an NVD_API_KEY to increase rate limits."
-                elif response.status == 404:
-                    return f"CVE API Error: No results found for keywords: {keyword_search}"
-                else:
-                    error_text = await response.text()
-                    return f"CVE API Error: Received status {response.status}. {error_text}"
-
-        # Step 4: Parse and format the results
+        # Step 3: Execute the API request(s) on the shared session, retrying transient failures
+        # and collect the results
+        failure_note = ""
+        session = await get_http_session()
+        semaphore = _get_nvd_semaphore()
+
+        data = await _fetch_cves(session, keyword_search, max_results, headers, semaphore)
+        if isinstance(data, str):
+            return data
         vulnerabilities = data.get("vulnerabilities", [])
         total_results = data.get("totalResults", 0)
 
+        if not vulnerabilities and len(keywords) > 1:
+            # No record matches every keyword: fall back to one search per keyword
+            results = await asyncio.gather(
+                *[_fetch_cves(session, keyword, max_results, headers, semaphore) for keyword in keywords],
+                return_exceptions=True
+            )
+            responses = [result for result in results if isinstance(result, dict)]
+            if not responses:
+                # Every search failed: surface the first failure
+                first = results[0]
+                if isinstance(first, BaseException):
+                    raise first
+                return first
+            failed_keywords = [keyword for keyword, result in zip(keywords, results) if not isinstance(result, dict)]
+            if failed_keywords:
+                logger.warning("NVD searches failed for keywords: %s", ", ".join(failed_keywords))
+                failure_note = f"Note: The searches for these keywords failed and are not included: {', '.join(failed_keywords)}\n"
+
+            # Merge, dedupe on CVE id, and keep the most recently published
+            merged = {}
+            for response_data in responses:
+                for vuln_item in response_data.get("vulnerabilities", []):
+                    cve_id = vuln_item.get("cve", {}).get("id")
+                    if cve_id and cve_id not in merged:
+                        merged[cve_id] = vuln_item
+            vulnerabilities = sorted(
+                merged.values(),
+                key=lambda item: item.get("cve", {}).get("published", ""),
+                reverse=True
+            )[:max_results]
+            total_results = sum(response_data.get("totalResults", 0) for response_data in responses)
+
         if not vulnerabilities:
-            return f"No CVE records found for keywords: {keyword_search}"
+            no_results = f"No CVE records found for keywords: {keyword_search}"
+            return f"{no_results}\n{failure_note}" if failure_note else no_results
 
-        # Step 5: Format output
-        formatted_output = f"CVE Search Results for '{keyword_search}':\n"
-        formatted_output += f"Found {total_results} total results (showing {len(vulnerabilities)})\n\n"
+        # Step 4: Format output
+        parts = [
+            f"CVE Search Results for '{keyword_search}':\n",
+            f"Found {total_results} total results (showing {len(vulnerabilities)})\n\n",
+        ]
 
+        # Bind dict.get once; this loop runs for up to 100 CVEs per search
+        get = dict.get
         for vuln_item in vulnerabilities:
-            cve = vuln_item.get("cve", {})
-            cve_id = cve.get("id", "Unknown")
+            cve = get(vuln_item, "cve", {})
+            cve_id = get(cve, "id", "Unknown")
 
             # Extract description (prefer English)
-            descriptions = cve.get("descriptions", [])
-            description = "No description available"
-            for desc in descriptions:
-                if desc.get("lang") == "en":
-                    description = desc.get("value", "No description available")
-                    break
+            description = next(
+                (desc["value"] for desc in get(cve, "descriptions", []) if get(desc, "lang") == "en" and get(desc, "value")),
+                "No description available"
+            )
 
             # Extract CVSS scores (prefer v3.1, then v3.0, then v2.0)
-            metrics = cve.get("metrics", {})
-            cvss_score = "Not scored"
-            cvss_severity = "Unknown"
-
-            if "cvssMetricV31" in metrics and metrics["cvssMetricV31"]:
-                cvss_data = metrics["cvssMetricV31"][0].get("cvssData", {})
-                cvss_score = cvss_data.get("baseScore", "N/A")
-                cvss_severity = cvss_data.get("baseSeverity", "Unknown")
-            elif "cvssMetricV30" in metrics and metrics["cvssMetricV30"]:
-                cvss_data = metrics["cvssMetricV30"][0].get("cvssData", {})
-                cvss_score = cvss_data.get("baseScore", "N/A")
-                cvss_severity = cvss_data.get("baseSeverity", "Unknown")
-            elif "cvssMetricV2" in metrics and metrics["cvssMetricV2"]:
-                cvss_data = metrics["cvssMetricV2"][0].get("cvssData", {})
-                cvss_score = cvss_data.get("baseScore", "N/A")
-                cvss_severity = metrics["cvssMetricV2"][0].get("baseSeverity", "Unknown")
+            cvss_score, cvss_severity = _extract_cvss(get(cve, "metrics", {}))
 
             # Extract dates
-            published = cve.get("published", "Unknown")
-            last_modified = cve.get("lastModified", "Unknown")
+            published = get(cve, "published", "Unknown")
+            last_modified = get(cve, "lastModified", "Unknown")
 
             # Extract references (limit to first 3)
-            references = cve.get("references", [])
-            ref_urls = [ref.get("url") for ref in references[:3] if ref.get("url")]
+            ref_urls = [url for url in (get(ref, "url") for ref in islice(get(cve, "references", []), 3)) if url]
             ref_string = "\n  ".join(ref_urls) if ref_urls else "No references available"
 
             # Format this CVE entry
-            formatted_output += f"--- {cve_id} ---\n"
-            formatted_output += f"Description: {description[:300]}{'...' if len(description) > 300 else ''}\n"
-            formatted_output += f"CVSS Score: {cvss_score} ({cvss_severity})\n"
-            formatted_output += f"Published: {published}\n"
-            formatted_output += f"Last Modified: {last_modified}\n"
-            formatted_output += f"References:\n  {ref_string}\n"
-            formatted_output += "\n" + "-" * 80 + "\n\n"
+            parts.append(
+                f"--- {cve_id} ---\n"
+                f"Description: {description[:300]}{'...' if len(description) > 300 else ''}\n"
+                f"CVSS Score: {cvss_score} ({cvss_severity})\n"
+                f"Published: {published}\n"
+                f"Last Modified: {last_modified}\n"
+                f"References:\n  {ref_string}\n"
+                f"{CVE_ENTRY_SEPARATOR}"
+            )
+
+        if failure_note:
+            # A partial merge is returned but not cached, so a later call retries the failed searches
+            parts.append(failure_note)
+            return "".join(parts)
+
+        formatted_output = "".join(parts)
+
+        # Step 5: Write the result through to the cache in the background
+        save_cached_document_async(CVE_CACHE_COLLECTION, cache_key, {
+            "keywords": keywords,
+            "max_results": max_results,
+            "formatted": formatted_output
+        })
 
         return formatted_output
 
     except asyncio.TimeoutError:
-        logging.warning("CVE API request timed out after 60 seconds")
+        logger.warning("CVE API request timed out after %g seconds", REQUEST_TIMEOUT.total)
         return f"CVE API Error: Request timed out. The NVD API may be experiencing high load. Please try again later."
     except Exception as e:
-        logging.error(f"CVE API search failed with error: {str(e)}")
+        logger.error("CVE API search failed with error: %s", e)
         return f"CVE API Error: {str(e)}"
@@ -3,14 +3,34 @@
 import asyncio
 import logging
 
-import aiohttp
+import orjson
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 
+from open_deep_research.firestore_cache import (
+    get_cached_document,
+    save_cached_document_async,
+)
+from open_deep_research.utils import (
+    REQUEST_TIMEOUT,
+    format_api_error,
+    get_http_session,
+    request_with_retry,
+)
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
 ##########################
 # Mozilla Observatory API Tool
 ##########################
 
+OBSERVATORY_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Successful scans are cached per domain; headers rarely change within hours
+OBSERVATORY_CACHE_COLLECTION = "observatory_cache"
+OBSERVATORY_CACHE_TTL = 6 * 3600
+
 OBSERVATORY_SCAN_DESCRIPTION = (
     "Scan a website's security headers and configurations using Mozilla Observatory. "
     "Returns a security grade (A+ to F), numerical score, and test results. "
@@ -33,6 +53,12 @@ async def observatory_scan(
         Formatted string containing security grade, score, test results, and details URL
     """
     try:
+        # Return a recent scan of the same domain if there is one
+        cache_key = domain.lower().strip()
+        cached = await get_cached_document(OBSERVATORY_CACHE_COLLECTION, cache_key, OBSERVATORY_CACHE_TTL)
+        if cached and cached.get("formatted"):
+            return cached["formatted"]
+
         # Step 1: Prepare the API request
         base_url = "https://observatory-api.mdn.mozilla.net/api/v2/scan"
 
@@ -41,22 +67,27 @@ async def observatory_scan(
             "host": domain
         }
 
-        # Step 2: Execute the API request with timeout
-        timeout = aiohttp.ClientTimeout(total=60.0)
+        # Step 2: Execute the API request on the shared session, retrying transient failures
+        # (500 is not retried: Observatory uses it for deterministic scan failures)
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(base_url, params=params, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                else:
-                    error_text = await response.text()
-                    try:
-                        error_json = await response.json()
-                        if error_json.get("error") == "scan-failed":
-                            return f"Observatory Scan Error for '{domain}': {error_json.get('message', 'Unknown error')}"
-                    except:
-                        pass
-                    return f"Observatory API Error: Received status {response.status}. {error_text}"
+        session = await get_http_session()
+        status, body = await request_with_retry(
+            session.post,
+            base_url,
+            retry_statuses=OBSERVATORY_RETRY_STATUSES,
+            params=params,
+            headers=headers
+        )
+        if status == 200:
+            data = orjson.loads(body)
+        else:
+            try:
+                error_json = orjson.loads(body)
+                if error_json.get("error") == "scan-failed":
+                    return f"Observatory Scan Error for '{domain}': {error_json.get('message', 'Unknown error')}"
+            except (orjson.JSONDecodeError, AttributeError):
+                pass
+            return format_api_error("Observatory API", status, body)
 
         # Step 3: Check for error in response
         if data.get("error"):
@@ -94,11 +125,19 @@ async def observatory_scan(
         formatted_output += "Note: For detailed per-test breakdowns, visit the full report URL above.\n"
         formatted_output += "-" * 80 + "\n"
 
+        # Step 6: Write the result through to the cache in the background
+        save_cached_document_async(OBSERVATORY_CACHE_COLLECTION, cache_key, {
+            "formatted": formatted_output,
+            "grade": grade,
+            "score": score,
+            "scanned_at": scanned_at,
+        })
+
         return formatted_output
 
     except asyncio.TimeoutError:
-        logging.warning("Observatory API request timed out after 60 seconds")
+        logger.warning("Observatory API request timed out after %g seconds", REQUEST_TIMEOUT.total)
         return f"Observatory API Error: Request timed out for '{domain}'. The API may be experiencing high load. Please try again later."
     except Exception as e:
-        logging.error(f"Observatory API scan failed with error: {str(e)}")
+        logger.error("Observatory API scan failed with error: %s", e)
         return f"Observatory API Error for '{domain}': {str(e)}"
@@ -2,24 +2,226 @@
 
 import asyncio
 import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import List, Optional
 from urllib.parse import quote
 
-import aiohttp
+import orjson
+from aiohttp import ClientSession
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 
-from open_deep_research.utils import get_google_api_key
+from open_deep_research.utils import (
+    REQUEST_TIMEOUT,
+    format_api_error,
+    get_google_api_key,
+    get_http_session,
+)
+
+# Initialize logging
+logger = logging.getLogger(__name__)
 
 ##########################
 # Google Web Risk API Tool
 ##########################
 
+# Web Risk API supports: MALWARE, SOCIAL_ENGINEERING, UNWANTED_SOFTWARE
+WEB_RISK_THREAT_TYPES = ("MALWARE", "SOCIAL_ENGINEERING", "UNWANTED_SOFTWARE")
+WEB_RISK_SEARCH_URL = "https://webrisk.googleapis.com/v1/uris:search"
+
+# The threat type query parameters never change, so build them once
+_THREAT_PARAMS = "&".join(f"threatTypes={t}" for t in WEB_RISK_THREAT_TYPES)
+
+# Error messages for the statuses Web Risk documents
+_WEB_RISK_ERRORS = {
+    400: "Bad request. {body}",
+    403: "Rate limit exceeded or unauthorized. Please check your API key and rate limits.",
+}
+
+# Static pieces of the formatted verdicts
+_BAR = "=" * 80
+_BAR_NL = _BAR + "\n"
+_THREAT_WARNING = (
+    f"{_BAR_NL}"
+    "WARNING: This URL has been flagged by Google Web Risk.\n"
+    "Do not visit this URL or download content from it.\n"
+    f"{_BAR_NL}"
+)
+
+# Response bodies of a clean verdict
+_EMPTY_BODIES = (b"{}", b"")
+
+# Explanation shown for each threat type in a match
+_THREAT_DESCRIPTIONS = {
+    "MALWARE": "MALWARE: The URL hosts or distributes malicious software",
+    "SOCIAL_ENGINEERING": "SOCIAL_ENGINEERING: The URL attempts to trick users into sharing personal information",
+    "UNWANTED_SOFTWARE": "UNWANTED_SOFTWARE: The URL hosts software that may be deceptive or unwanted",
+}
+
+# Local verdict cache, as the Web Risk usage policy asks clients to do.
+# Threat matches are kept until their expireTime; a clean verdict carries no
+# expiry, so it is kept for a short fixed time
+_VERDICT_CACHE_SIZE = 1024
+_VERDICT_CACHE_MAX_TTL = 24 * 3600  # seconds
+_NEGATIVE_CACHE_TTL = 300.0  # seconds
+_VERDICT_CACHE: "OrderedDict[str, tuple[float, Optional[dict]]]" = OrderedDict()
+
 SAFE_BROWSING_CHECK_DESCRIPTION = (
     "Check if a URL is flagged by Google Web Risk as malware, "
     "social engineering, or unwanted software. "
     "Returns threat information including threat types and cache expiration."
 )
 
+SAFE_BROWSING_CHECK_BATCH_DESCRIPTION = (
+    "Check several URLs at once against Google Web Risk for malware, "
+    "social engineering, or unwanted software. "
+    "Faster than calling safe_browsing_check once per URL. "
+    "Returns the threat information for each URL."
+)
+
+
+@lru_cache(maxsize=4096)
+def _quote_url(url: str) -> str:
+    """Percent-encode a URL for the uri query parameter.
+
+    Cached because retries and batch lookups encode the same URLs repeatedly.
+    """
+    return quote(url, safe='')
+
+
+def _parse_expire_time(expire_time: str) -> Optional[float]:
+    """Convert an RFC 3339 expireTime into seconds from now.
+
+    Fractional seconds are ignored, since Web Risk may send nanoseconds that
+    datetime cannot parse.
+
+    Returns:
+        Remaining lifetime in seconds, or None if expire_time is unparseable
+    """
+    try:
+        expires_at = datetime.strptime(expire_time[:19], "%Y-%m-%dT%H:%M:%S")
+    except (TypeError, ValueError):
+        return None
+    return (expires_at.replace(tzinfo=timezone.utc) - datetime.now(timezone.utc)).total_seconds()
+
+
+def _get_cached_verdict(url: str) -> tuple[bool, Optional[dict]]:
+    """Look up a URL in the local verdict cache, evicting it if expired.
+
+    Returns:
+        (hit, threat): threat is None for a cached clean verdict
+    """
+    entry = _VERDICT_CACHE.get(url)
+    if entry is None:
+        return False, None
+    expires_at, threat = entry
+    if expires_at <= time.monotonic():
+        del _VERDICT_CACHE[url]
+        return False, None
+    _VERDICT_CACHE.move_to_end(url)
+    return True, threat
+
+
+def _cache_verdict(url: str, threat: Optional[dict]) -> None:
+    """Store a Web Risk verdict for url until it expires."""
+    if threat:
+        ttl = _parse_expire_time(threat.get("expireTime"))
+        if ttl is None:
+            ttl = _NEGATIVE_CACHE_TTL
+        ttl = min(ttl, _VERDICT_CACHE_MAX_TTL)
+    else:
+        ttl = _NEGATIVE_CACHE_TTL
+    if ttl <= 0:
+        return
+
+    _VERDICT_CACHE[url] = (time.monotonic() + ttl, threat)
+    _VERDICT_CACHE.move_to_end(url)
+    while len(_VERDICT_CACHE) > _VERDICT_CACHE_SIZE:
+        _VERDICT_CACHE.popitem(last=False)
+
+
+async def _check_url(session: ClientSession, url: str, api_key: str) -> str:
+    """Look up one URL with the Web Risk API and format the verdict.
+
+    Args:
+        session: Shared aiohttp session to issue the request on
+        url: URL to check (must be valid per RFC 2396)
+        api_key: Google API key with Web Risk enabled
+
+    Returns:
+        Formatted threat information, confirmation that the URL is safe, or an
+        API error message
+    """
+    # Step 1: Serve a verdict that has not expired yet from the local cache
+    hit, threat = _get_cached_verdict(url)
+    if hit:
+        return _format_verdict(url, threat)
+
+    # Step 2: Build the GET request URL with query parameters
+    # URL-encode the URI parameter
+    encoded_uri = _quote_url(url)
+
+    # Construct the full URL
+    request_url = f"{WEB_RISK_SEARCH_URL}?{_THREAT_PARAMS}&uri={encoded_uri}&key={api_key}"
+
+    # Step 3: Execute the GET request on the shared session
+    async with session.get(request_url, timeout=REQUEST_TIMEOUT) as response:
+        status = response.status
+        body = await response.read()
+    if status != 200:
+        return format_api_error("Web Risk API", status, body, _WEB_RISK_ERRORS)
+
+    # Step 4: Parse the response
+    # Empty response {} means URL is safe (the common case, so skip parsing it)
+    # Response with "threat" object means threat detected
+    body = body.strip()
+    threat = orjson.loads(body).get("threat") if body not in _EMPTY_BODIES else None
+    _cache_verdict(url, threat)
+    return _format_verdict(url, threat)
+
+
+def _format_verdict(url: str, threat: Optional[dict]) -> str:
+    """Format a Web Risk verdict for url; threat is None if the URL is safe."""
+    if not threat:
+        return (
+            f"Web Risk Check Results for '{url}':\n"
+            f"{_BAR_NL}\n"
+            "STATUS: ✓ SAFE\n\n"
+            "The URL is not flagged on any Google Web Risk threat lists.\n"
+            f"{_BAR_NL}"
+        )
+
+    # Format output for threats
+    # Get threat types and expiration time
+    threat_types_list = threat.get("threatTypes", [])
+    expire_time = threat.get("expireTime", "Unknown")
+
+    parts = [
+        f"Web Risk Check Results for '{url}':\n",
+        _BAR_NL,
+        "\nSTATUS: ⚠️ THREAT DETECTED\n\n",
+        "--- THREAT INFORMATION ---\n",
+        f"URL: {url}\n",
+        f"Threat Types: {', '.join(threat_types_list)}\n",
+        f"Cache Expiration: {expire_time}\n\n",
+    ]
+
+    # Provide detailed description of each threat type
+    if threat_types_list:
+        parts.append("Threat Descriptions:\n")
+        parts.extend(
+            f"  - {_THREAT_DESCRIPTIONS.get(threat_type, threat_type)}\n"
+            for threat_type in threat_types_list
+        )
+        parts.append("\n")
+
+    parts.append(_THREAT_WARNING)
+
+    return "".join(parts)
+
 
 @tool(description=SAFE_BROWSING_CHECK_DESCRIPTION)
 async def safe_browsing_check(
@@ -42,87 +244,62 @@ async def safe_browsing_check(
         if not api_key:
             return "Web Risk API Error: GOOGLE_API_KEY not found. Please configure the API key."
 
-        # Step 2: Build the GET request URL with query parameters
-        # URL-encode the URI parameter
-        encoded_uri = quote(url, safe='')
-
-        # Build threat types query parameters
-        # Web Risk API supports: MALWARE, SOCIAL_ENGINEERING, UNWANTED_SOFTWARE
-        threat_types = [
-            "MALWARE",
-            "SOCIAL_ENGINEERING",
-            "UNWANTED_SOFTWARE"
-        ]
-        threat_params = "&".join([f"threatTypes={t}" for t in threat_types])
-
-        # Construct the full URL
-        request_url = f"https://webrisk.googleapis.com/v1/uris:search?{threat_params}&uri={encoded_uri}&key={api_key}"
-
-        # Step 3: Execute the GET request with timeout
-        timeout = aiohttp.ClientTimeout(total=60.0)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(request_url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                elif response.status == 400:
-                    error_text = await response.text()
-                    return f"Web Risk API Error: Bad request. {error_text}"
-                elif response.status == 403:
-                    return "Web Risk API Error: Rate limit exceeded or unauthorized. Please check your API key and rate limits."
-                else:
-                    error_text = await response.text()
-                    return f"Web Risk API Error: Received status {response.status}. {error_text}"
-
-        # Step 4: Parse the response
-        # Empty response {} means URL is safe
-        # Response with "threat" object means threat detected
-        threat = data.get("threat")
-
-        if not threat:
-            formatted_output = f"Web Risk Check Results for '{url}':\n"
-            formatted_output += "=" * 80 + "\n\n"
-            formatted_output += "STATUS: ✓ SAFE\n\n"
-            formatted_output += "The URL is not flagged on any Google Web Risk threat lists.\n"
-            formatted_output += "=" * 80 + "\n"
-            return formatted_output
-
-        # Step 5: Format output for threats
-        formatted_output = f"Web Risk Check Results for '{url}':\n"
-        formatted_output += "=" * 80 + "\n\n"
-        formatted_output += "STATUS: ⚠️ THREAT DETECTED\n\n"
-
-        # Get threat types and expiration time
-        threat_types_list = threat.get("threatTypes", [])
-        expire_time = threat.get("expireTime", "Unknown")
-
-        formatted_output += "--- THREAT INFORMATION ---\n"
-        formatted_output += f"URL: {url}\n"
-        formatted_output += f"Threat Types: {', '.join(threat_types_list)}\n"
-        formatted_output += f"Cache Expiration: {expire_time}\n"
-        formatted_output += "\n"
-
-        # Provide detailed description of each threat type
-        if threat_types_list:
-            formatted_output += "Threat Descriptions:\n"
-            for threat_type in threat_types_list:
-                if threat_type == "MALWARE":
-                    formatted_output += "  - MALWARE: The URL hosts or distributes malicious software\n"
-                elif threat_type == "SOCIAL_ENGINEERING":
-                    formatted_output += "  - SOCIAL_ENGINEERING: The URL attempts to trick users into sharing personal information\n"
-                elif threat_type == "UNWANTED_SOFTWARE":
-                    formatted_output += "  - UNWANTED_SOFTWARE: The URL hosts software that may be deceptive or unwanted\n"
-            formatted_output += "\n"
-
-        formatted_output += "=" * 80 + "\n"
-        formatted_output += "WARNING: This URL has been flagged by Google Web Risk.\n"
-        formatted_output += "Do not visit this URL or download content from it.\n"
-        formatted_output += "=" * 80 + "\n"
-
-        return formatted_output
+        # Step 2: Check the URL on the shared session
+        session = await get_http_session()
+        return await _check_url(session, url, api_key)
 
     except asyncio.TimeoutError:
-        logging.warning("Web Risk API request timed out after 60 seconds")
+        logger.warning("Web Risk API request timed out after %g seconds", REQUEST_TIMEOUT.total)
         return f"Web Risk API Error: Request timed out. The API may be experiencing high load. Please try again later."
     except Exception as e:
-        logging.error(f"Web Risk API check failed with error: {str(e)}")
+        logger.error("Web Risk API check failed with error: %s", e)
+        return f"Web Risk API Error: {str(e)}"
+
+
+@tool(description=SAFE_BROWSING_CHECK_BATCH_DESCRIPTION)
+async def safe_browsing_check_batch(
+    urls: List[str],
+    config: RunnableConfig = None
+) -> str:
+    """Check several URLs against Google Web Risk threat lists concurrently.
+
+    Web Risk has no batch lookup endpoint, so the URLs are looked up
+    concurrently over the shared session's keep-alive connections.
+
+    Args:
+        urls: URLs to check (each must be valid per RFC 2396)
+        config: Runtime configuration for API key access
+
+    Returns:
+        Formatted results for each URL, in the order given
+    """
+    api_key = get_google_api_key(config)
+    if not api_key:
+        return "Web Risk API Error: GOOGLE_API_KEY not found. Please configure the API key."
+
+    # Deduplicate while keeping the caller's order
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return "Web Risk API Error: No URLs provided."
+
+    try:
+        session = await get_http_session()
+    except Exception as e:
+        logger.error("Web Risk API batch check failed with error: %s", e)
         return f"Web Risk API Error: {str(e)}"
+
+    results = await asyncio.gather(
+        *(_check_url(session, url, api_key) for url in unique_urls),
+        return_exceptions=True
+    )
+
+    outputs = []
+    for url, result in zip(unique_urls, results):
+        if isinstance(result, asyncio.TimeoutError):
+            logger.warning("Web Risk API request timed out for '%s'", url)
+            result = f"Web Risk API Error: Request timed out for '{url}'. Please try again later.\n"
+        elif isinstance(result, Exception):
+            logger.error("Web Risk API check failed for '%s' with error: %s", url, result)
+            result = f"Web Risk API Error for '{url}': {str(result)}\n"
+        outputs.append(result)
+    return "\n".join(outputs)
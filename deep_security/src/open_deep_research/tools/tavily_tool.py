@@ -20,6 +20,9 @@ from open_deep_research.utils import (
     get_today_str,
 )
 
+# Initialize logging
+logger = logging.getLogger(__name__)
+
 ##########################
 # Tavily Search Tool
 ##########################
@@ -197,9 +200,9 @@ async def summarize_webpage(model: BaseChatModel, webpage_content: str) -> str:
 
     except asyncio.TimeoutError:
         # Timeout during summarization - return original content
-        logging.warning("Summarization timed out after 60 seconds, returning original content")
+        logger.warning("Summarization timed out after 60 seconds, returning original content")
         return webpage_content
     except Exception as e:
         # Other errors during summarization - log and return original content
-        logging.warning(f"Summarization failed with error: {str(e)}, returning original content")
+        logger.warning("Summarization failed with error: %s, returning original content", e)
         return webpage_content
@@ -0,0 +1,85 @@
+"""Composite threat scan tool combining Web Risk and VirusTotal lookups."""
+
+import asyncio
+import logging
+from typing import Optional
+
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import tool
+
+from open_deep_research.tools.safe_browsing_tool import _check_url
+from open_deep_research.tools.virustotal_tool import _scan_hash
+from open_deep_research.utils import (
+    get_google_api_key,
+    get_http_session,
+    get_virustotal_api_key,
+)
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+##########################
+# Full Threat Scan Tool
+##########################
+
+FULL_THREAT_SCAN_DESCRIPTION = (
+    "Check a URL with Google Web Risk and a file hash with VirusTotal in one call. "
+    "Provide a url, a file_hash, or both; the lookups run concurrently. "
+    "Returns the Web Risk verdict and the VirusTotal analysis report."
+)
+
+
+@tool(description=FULL_THREAT_SCAN_DESCRIPTION)
+async def full_threat_scan(
+    url: Optional[str] = None,
+    file_hash: Optional[str] = None,
+    config: RunnableConfig = None
+) -> str:
+    """Run the Web Risk and VirusTotal lookups concurrently and merge the results.
+
+    Args:
+        url: URL to check against Google Web Risk threat lists
+        file_hash: SHA-256, SHA-1, or MD5 hash to look up in VirusTotal
+        config: Runtime configuration for API key access
+
+    Returns:
+        Formatted Web Risk and VirusTotal results, one section per lookup
+    """
+    if not url and not file_hash:
+        return "Threat Scan Error: Provide a url, a file_hash, or both."
+
+    try:
+        session = await get_http_session()
+    except Exception as e:
+        logger.error("Threat scan failed with error: %s", e)
+        return f"Threat Scan Error: {str(e)}"
+
+    # Step 1: Start one lookup per requested signal on the shared session
+    sections = {}
+    lookups = {}
+    if url:
+        api_key = get_google_api_key(config)
+        if api_key:
+            lookups["Web Risk"] = _check_url(session, url, api_key)
+        else:
+            sections["Web Risk"] = "Web Risk API Error: GOOGLE_API_KEY not found. Please configure the API key.\n"
+    if file_hash:
+        api_key = get_virustotal_api_key(config)
+        if api_key:
+            lookups["VirusTotal"] = _scan_hash(session, file_hash, api_key)
+        else:
+            sections["VirusTotal"] = "VirusTotal API Error: VIRUSTOTAL_API_KEY not found. Please configure the API key.\n"
+
+    # Step 2: Wait for all of them; one failing lookup does not cancel the others
+    results = await asyncio.gather(*lookups.values(), return_exceptions=True)
+    for label, result in zip(lookups, results):
+        if isinstance(result, asyncio.TimeoutError):
+            logger.warning("%s API request timed out during threat scan", label)
+            result = f"{label} API Error: Request timed out. Please try again later.\n"
+        elif isinstance(result, Exception):
+            logger.error("%s API lookup failed during threat scan with error: %s", label, result)
+            result = f"{label} API Error: {str(result)}\n"
+        sections[label] = result
+
+    # Step 3: Merge the results in a fixed order
+    return "\n".join(sections[label] for label in ("Web Risk", "VirusTotal") if label in sections)
@@ -2,24 +2,273 @@
 
 import asyncio
 import logging
-from typing import Annotated
+from itertools import islice
+from typing import Annotated, List, Union
 
-import aiohttp
+import orjson
+from aiohttp import ClientSession
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import InjectedToolArg, tool
+from pydantic import BaseModel, ConfigDict, computed_field
 
-from open_deep_research.utils import get_virustotal_api_key
+from open_deep_research.firestore_cache import (
+    get_cached_document,
+    save_cached_document_async,
+)
+from open_deep_research.utils import (
+    REQUEST_TIMEOUT,
+    format_api_error,
+    get_http_session,
+    get_virustotal_api_key,
+)
+
+# Initialize logging
+logger = logging.getLogger(__name__)
 
 ##########################
 # VirusTotal File Analysis Tool
 ##########################
 
+# Reports are cached per hash: the public API allows only 4 requests per minute,
+# and verdicts only change as engines update
+VIRUSTOTAL_CACHE_COLLECTION = "virustotal_cache"
+VIRUSTOTAL_CACHE_TTL = 86400  # 24 hours
+
+# Error messages for the statuses VirusTotal documents (404 names the hash)
+_VIRUSTOTAL_ERRORS = {
+    403: "Rate limit exceeded or unauthorized. Please check your API key and rate limits.",
+}
+
+# Engine verdicts listed under DETECTION DETAILS
+DETECTION_CATEGORIES = frozenset({"malicious", "suspicious"})
+MAX_DETECTIONS_SHOWN = 10
+
+# Banner line framing the formatted report
+_BAR = "=" * 80
+_BAR_NL = _BAR + "\n"
+
 VIRUSTOTAL_SCAN_DESCRIPTION = (
     "Analyze a file using VirusTotal by its hash (SHA-256, SHA-1, or MD5). "
     "Retrieves security analysis results from multiple antivirus engines. "
     "Returns detection statistics, file information, signature details, and threat assessment."
 )
 
+VIRUSTOTAL_SCAN_RAW_DESCRIPTION = (
+    "Look up a file in VirusTotal by its hash (SHA-256, SHA-1, or MD5) and return the result as JSON. "
+    "Includes detection counts, risk_level, signature details, and the first detections. "
+    "Use this instead of virustotal_scan when only specific fields such as risk_level are needed."
+)
+
+
+class VirusTotalReport(BaseModel):
+    """Fields of a VirusTotal file report used by the scan tools."""
+    model_config = ConfigDict(frozen=True)
+
+    # File identifiers
+    name: str = "Unknown"
+    sha256: str = "Unknown"
+    sha1: str = "Unknown"
+    md5: str = "Unknown"
+    size: int = 0
+    file_type: str = "Unknown"
+    magic: str = "Unknown"
+    tags: List[str] = []
+
+    # Analysis statistics
+    malicious: int = 0
+    suspicious: int = 0
+    undetected: int = 0
+    harmless: int = 0
+
+    # Signature information
+    is_signed: bool = False
+    signer: str = "Not signed"
+    signers: str = "N/A"
+
+    # First few malicious/suspicious detections and how many more there are
+    detections: List[str] = []
+    more_detections: int = 0
+
+    @computed_field
+    @property
+    def total_engines(self) -> int:
+        """Number of engines that returned a verdict."""
+        return self.malicious + self.suspicious + self.undetected + self.harmless
+
+    @computed_field
+    @property
+    def risk_level(self) -> str:
+        """Overall risk derived from the detection counts."""
+        if self.malicious > 0:
+            return "HIGH RISK"
+        if self.suspicious > 0:
+            return "MODERATE RISK"
+        if self.harmless > 0:
+            return "LOW RISK"
+        return "UNKNOWN"
+
+
+_RISK_MARKERS = {"HIGH RISK": "⚠️", "MODERATE RISK": "⚠️", "LOW RISK": "✓", "UNKNOWN": "?"}
+
+
+def _parse_report(attributes: dict) -> VirusTotalReport:
+    """Extract the report fields from the attributes of a VirusTotal file object."""
+    # Bind the lookups once; the report reads a dozen fields from the same dicts
+    get = attributes.get
+
+    # Analysis statistics
+    last_analysis_stats = get("last_analysis_stats", {})
+    stats_get = last_analysis_stats.get
+
+    # Signature information
+    signature_info = get("signature_info", {})
+
+    # Detection results (only the first few malicious/suspicious detections are kept,
+    # the rest are just counted)
+    last_analysis_results = get("last_analysis_results", {})
+    detection_iter = (
+        f"{engine_name}: {result.get('result', 'Unknown threat')}"
+        for engine_name, result in last_analysis_results.items()
+        if result.get("category") in DETECTION_CATEGORIES
+    )
+    detections = list(islice(detection_iter, MAX_DETECTIONS_SHOWN))
+
+    return VirusTotalReport(
+        name=get("meaningful_name", "Unknown"),
+        sha256=get("sha256", "Unknown"),
+        sha1=get("sha1", "Unknown"),
+        md5=get("md5", "Unknown"),
+        size=get("size", 0),
+        file_type=get("type_description", "Unknown"),
+        magic=get("magic", "Unknown"),
+        tags=get("tags", []),
+        malicious=stats_get("malicious", 0),
+        suspicious=stats_get("suspicious", 0),
+        undetected=stats_get("undetected", 0),
+        harmless=stats_get("harmless", 0),
+        is_signed=signature_info.get("verified") == "Signed",
+        signer=signature_info.get("product", "Not signed"),
+        signers=signature_info.get("signers", "N/A"),
+        detections=detections,
+        more_detections=sum(1 for _ in detection_iter),
+    )
+
+
+def _format_report(report: VirusTotalReport) -> str:
+    """Format a VirusTotal report as the text returned by virustotal_scan."""
+    tags_str = ", ".join(report.tags) if report.tags else "None"
+    risk_level = report.risk_level
+
+    parts = [
+        f"VirusTotal Analysis Report for '{report.name}':\n",
+        _BAR_NL,
+        "\n"
+
+        # File Information
+        "FILE INFORMATION:\n"
+        f"  Name: {report.name}\n"
+        f"  Type: {report.file_type}\n"
+        f"  Magic: {report.magic}\n"
+        f"  Size: {report.size:,} bytes\n"
+        f"  SHA-256: {report.sha256}\n"
+        f"  SHA-1: {report.sha1}\n"
+        f"  MD5: {report.md5}\n"
+        f"  Tags: {tags_str}\n\n",
+
+        # Security Assessment
+        "SECURITY ASSESSMENT:\n"
+        f"  Total Engines Scanned: {report.total_engines}\n"
+        f"  Malicious Detections: {report.malicious}\n"
+        f"  Suspicious Detections: {report.suspicious}\n"
+        f"  Harmless: {report.harmless}\n"
+        f"  Undetected: {report.undetected}\n\n"
+        f"  Risk Level: {_RISK_MARKERS[risk_level]} {risk_level}\n\n",
+
+        # Signature Information
+        "SIGNATURE INFORMATION:\n"
+        f"  Signed: {'Yes' if report.is_signed else 'No'}\n",
+    ]
+    if report.is_signed:
+        parts.append(f"  Signer: {report.signer}\n  Signers: {report.signers}\n")
+    parts.append("\n")
+
+    # Detection Details (if any)
+    if report.detections:
+        parts.append("DETECTION DETAILS:\n")
+        parts.extend(f"  {i}. {detection}\n" for i, detection in enumerate(report.detections, 1))
+        if report.more_detections:
+            parts.append(f"  ... and {report.more_detections} more detections\n")
+        parts.append("\n")
+
+    parts.append(_BAR_NL)
+    return "".join(parts)
+
+
+async def _get_report(session: ClientSession, file_hash: str, api_key: str) -> Union[VirusTotalReport, str]:
+    """Fetch the VirusTotal file report for a hash, using the cache when possible.
+
+    Args:
+        session: Shared aiohttp session to issue the request on
+        file_hash: SHA-256, SHA-1, or MD5 hash identifying the file
+        api_key: VirusTotal API key
+
+    Returns:
+        The parsed report, or an API error message
+    """
+    # Return a recent report for the same hash if there is one
+    cache_key = file_hash.lower().strip()
+    cached = await get_cached_document(VIRUSTOTAL_CACHE_COLLECTION, cache_key, VIRUSTOTAL_CACHE_TTL)
+    if cached and cached.get("report"):
+        return VirusTotalReport.model_validate(cached["report"])
+
+    # Step 1: Prepare the API request
+    base_url = f"https://www.virustotal.com/api/v3/files/{file_hash}"
+
+    # Step 2: Set up headers with API key (required)
+    headers = {
+        "x-apikey": api_key
+    }
+
+    # Step 3: Execute the API request on the shared session
+    async with session.get(base_url, headers=headers, timeout=REQUEST_TIMEOUT) as response:
+        status = response.status
+        body = await response.read()
+    if status == 404:
+        return f"VirusTotal API Error: File with hash '{file_hash}' not found in VirusTotal database."
+    if status != 200:
+        return format_api_error("VirusTotal API", status, body, _VIRUSTOTAL_ERRORS)
+    data = orjson.loads(body)
+
+    # Step 4: Parse the response
+    attributes = data.get("data", {}).get("attributes", {})
+    if not attributes:
+        return f"VirusTotal API Error: Invalid response format for hash '{file_hash}'"
+    report = _parse_report(attributes)
+
+    # Step 5: Write the result through to the cache in the background
+    save_cached_document_async(VIRUSTOTAL_CACHE_COLLECTION, cache_key, {
+        "report": report.model_dump(),
+    })
+
+    return report
+
+
+async def _scan_hash(session: ClientSession, file_hash: str, api_key: str) -> str:
+    """Fetch the VirusTotal file report for a hash and format it.
+
+    Args:
+        session: Shared aiohttp session to issue the request on
+        file_hash: SHA-256, SHA-1, or MD5 hash identifying the file
+        api_key: VirusTotal API key
+
+    Returns:
+        Formatted analysis report or an API error message
+    """
+    report = await _get_report(session, file_hash, api_key)
+    if isinstance(report, str):
+        return report
+    return _format_report(report)
+
 
 @tool(description=VIRUSTOTAL_SCAN_DESCRIPTION)
 async def virustotal_scan(
@@ -37,137 +286,51 @@ async def virustotal_scan(
         file information, signature details, and security assessment
     """
     try:
-        # Step 1: Prepare the API request
-        base_url = f"https://www.virustotal.com/api/v3/files/{file_hash}"
-
-        # Step 2: Set up headers with API key (required)
+        # Step 1: Look up the API key (required)
         api_key = get_virustotal_api_key(config)
         if not api_key:
             return "VirusTotal API Error: VIRUSTOTAL_API_KEY not found. Please configure the API key."
 
-        headers = {
-            "x-apikey": api_key
-        }
-
-        # Step 3: Execute the API request with timeout
-        timeout = aiohttp.ClientTimeout(total=60.0)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(base_url, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                elif response.status == 403:
-                    return "VirusTotal API Error: Rate limit exceeded or unauthorized. Please check your API key and rate limits."
-                elif response.status == 404:
-                    return f"VirusTotal API Error: File with hash '{file_hash}' not found in VirusTotal database."
-                else:
-                    error_text = await response.text()
-                    return f"VirusTotal API Error: Received status {response.status}. {error_text}"
-
-        # Step 4: Parse the response
-        attributes = data.get("data", {}).get("attributes", {})
-        if not attributes:
-            return f"VirusTotal API Error: Invalid response format for hash '{file_hash}'"
-
-        # Step 5: Extract key information
-        # File identifiers
-        sha256 = attributes.get("sha256", "Unknown")
-        sha1 = attributes.get("sha1", "Unknown")
-        md5 = attributes.get("md5", "Unknown")
-        meaningful_name = attributes.get("meaningful_name", "Unknown")
-        size = attributes.get("size", 0)
-        file_type = attributes.get("type_description", "Unknown")
-        magic = attributes.get("magic", "Unknown")
-
-        # Analysis statistics
-        last_analysis_stats = attributes.get("last_analysis_stats", {})
-        malicious = last_analysis_stats.get("malicious", 0)
-        suspicious = last_analysis_stats.get("suspicious", 0)
-        undetected = last_analysis_stats.get("undetected", 0)
-        harmless = last_analysis_stats.get("harmless", 0)
-        total_engines = malicious + suspicious + undetected + harmless
-
-        # Signature information
-        signature_info = attributes.get("signature_info", {})
-        is_signed = signature_info.get("verified") == "Signed"
-        signer_name = signature_info.get("product", "Not signed")
-        signers = signature_info.get("signers", "N/A")
-
-        # Detection results (get first few malicious/suspicious detections)
-        last_analysis_results = attributes.get("last_analysis_results", {})
-        detections = []
-        for engine_name, result in last_analysis_results.items():
-            category = result.get("category", "")
-            if category in ["malicious", "suspicious"]:
-                detection_name = result.get("result", "Unknown threat")
-                detections.append(f"{engine_name}: {detection_name}")
-
-        # Tags
-        tags = attributes.get("tags", [])
-        tags_str = ", ".join(tags) if tags else "None"
-
-        # Step 6: Format output
-        formatted_output = f"VirusTotal Analysis Report for '{meaningful_name}':\n"
-        formatted_output += "=" * 80 + "\n\n"
+        # Step 2: Fetch and format the report on the shared session
+        session = await get_http_session()
+        return await _scan_hash(session, file_hash, api_key)
 
-        # File Information
-        formatted_output += "FILE INFORMATION:\n"
-        formatted_output += f"  Name: {meaningful_name}\n"
-        formatted_output += f"  Type: {file_type}\n"
-        formatted_output += f"  Magic: {magic}\n"
-        formatted_output += f"  Size: {size:,} bytes\n"
-        formatted_output += f"  SHA-256: {sha256}\n"
-        formatted_output += f"  SHA-1: {sha1}\n"
-        formatted_output += f"  MD5: {md5}\n"
-        formatted_output += f"  Tags: {tags_str}\n\n"
+    except asyncio.TimeoutError:
+        logger.warning("VirusTotal API request timed out after %g seconds", REQUEST_TIMEOUT.total)
+        return "VirusTotal API Error: Request timed out. The VirusTotal API may be experiencing high load. Please try again later."
+    except Exception as e:
+        logger.error("VirusTotal API scan failed with error: %s", e)
+        return f"VirusTotal API Error: {str(e)}"
 
-        # Security Assessment
-        formatted_output += "SECURITY ASSESSMENT:\n"
-        formatted_output += f"  Total Engines Scanned: {total_engines}\n"
-        formatted_output += f"  Malicious Detections: {malicious}\n"
-        formatted_output += f"  Suspicious Detections: {suspicious}\n"
-        formatted_output += f"  Harmless: {harmless}\n"
-        formatted_output += f"  Undetected: {undetected}\n\n"
-
-        # Risk assessment
-        if malicious > 0:
-            risk_level = "HIGH RISK"
-            risk_color = "⚠️"
-        elif suspicious > 0:
-            risk_level = "MODERATE RISK"
-            risk_color = "⚠️"
-        elif harmless > 0 and malicious == 0 and suspicious == 0:
-            risk_level = "LOW RISK"
-            risk_color = "✓"
-        else:
-            risk_level = "UNKNOWN"
-            risk_color = "?"
-
-        formatted_output += f"  Risk Level: {risk_color} {risk_level}\n\n"
 
-        # Signature Information
-        formatted_output += "SIGNATURE INFORMATION:\n"
-        formatted_output += f"  Signed: {'Yes' if is_signed else 'No'}\n"
-        if is_signed:
-            formatted_output += f"  Signer: {signer_name}\n"
-            formatted_output += f"  Signers: {signers}\n"
-        formatted_output += "\n"
-
-        # Detection Details (if any)
-        if detections:
-            formatted_output += "DETECTION DETAILS:\n"
-            for i, detection in enumerate(detections[:10], 1):  # Limit to first 10
-                formatted_output += f"  {i}. {detection}\n"
-            if len(detections) > 10:
-                formatted_output += f"  ... and {len(detections) - 10} more detections\n"
-            formatted_output += "\n"
-
-        formatted_output += "=" * 80 + "\n"
-
-        return formatted_output
+@tool(description=VIRUSTOTAL_SCAN_RAW_DESCRIPTION)
+async def virustotal_scan_raw(
+    file_hash: str,
+    config: RunnableConfig = None
+) -> str:
+    """Get the VirusTotal analysis of a file by its hash as JSON.
+
+    Args:
+        file_hash: SHA-256, SHA-1, or MD5 hash identifying the file
+        config: Runtime configuration for API key access
+
+    Returns:
+        JSON object with the report fields, or an API error message
+    """
+    try:
+        api_key = get_virustotal_api_key(config)
+        if not api_key:
+            return "VirusTotal API Error: VIRUSTOTAL_API_KEY not found. Please configure the API key."
+
+        session = await get_http_session()
+        report = await _get_report(session, file_hash, api_key)
+        if isinstance(report, str):
+            return report
+        return orjson.dumps(report.model_dump()).decode()
 
     except asyncio.TimeoutError:
-        logging.warning("VirusTotal API request timed out after 60 seconds")
-        return f"VirusTotal API Error: Request timed out. The VirusTotal API may be experiencing high load. Please try again later."
+        logger.warning("VirusTotal API request timed out after %g seconds", REQUEST_TIMEOUT.total)
+        return "VirusTotal API Error: Request timed out. The VirusTotal API may be experiencing high load. Please try again later."
     except Exception as e:
-        logging.error(f"VirusTotal API scan failed with error: {str(e)}")
+        logger.error("VirusTotal API scan failed with error: %s", e)
         return f"VirusTotal API Error: {str(e)}"
@@ -3,9 +3,10 @@
 import asyncio
 import logging
 import os
+import random
 import warnings
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import aiohttp
 from langchain_core.messages import (
@@ -363,10 +364,29 @@ async def get_all_tools(config: RunnableConfig):
         List of all configured and available tools for research operations
     """
     # Import tools here to avoid circular dependency
-    from open_deep_research.tools import cve_search, observatory_scan, safe_browsing_check, think_tool, virustotal_scan
+    from open_deep_research.tools import (
+        cve_search,
+        full_threat_scan,
+        observatory_scan,
+        safe_browsing_check,
+        safe_browsing_check_batch,
+        think_tool,
+        virustotal_scan,
+        virustotal_scan_raw,
+    )
 
     # Start with core research tools
-    tools = [tool(ResearchComplete), think_tool, cve_search, observatory_scan, safe_browsing_check, virustotal_scan]
+    tools = [
+        tool(ResearchComplete),
+        think_tool,
+        cve_search,
+        observatory_scan,
+        safe_browsing_check,
+        safe_browsing_check_batch,
+        virustotal_scan,
+        virustotal_scan_raw,
+        full_threat_scan,
+    ]
 
     # Add configured search tools
     configurable = Configuration.from_runnable_config(config)
@@ -390,6 +410,157 @@ def get_notes_from_tool_calls(messages: list[MessageLikeRepresentation]):
     """Extract notes from tool call messages."""
     return [tool_msg.content for tool_msg in filter_messages(messages, include_types="tool")]
 
+##########################
+# HTTP Session Utils
+##########################
+
+# Shared client session for the external API tools, so repeated calls reuse
+# pooled keep-alive connections instead of paying a TCP/TLS handshake each time.
+# The session only bounds connecting and reading; overall deadlines are set per
+# request (REQUEST_TIMEOUT) so fast lookups fail fast instead of after 60 seconds
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=None, connect=5.0, sock_connect=5.0, sock_read=30.0)
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15.0, connect=5.0, sock_connect=5.0)
+_http_session: Optional[aiohttp.ClientSession] = None
+_http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_resolver() -> Optional[aiohttp.abc.AbstractResolver]:
+    """Return an aiodns-backed resolver, or None to use aiohttp's default.
+
+    The default resolver runs getaddrinfo in the thread pool; aiodns resolves
+    on the event loop instead. aiodns is optional (the "dns" extra).
+    """
+    try:
+        return aiohttp.AsyncResolver()
+    except RuntimeError:
+        # aiodns is not installed
+        return None
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it on first use.
+
+    The session is bound to the event loop it was created on, so a new one is
+    created if the previous session was closed or belongs to another loop.
+
+    Returns:
+        Process-wide aiohttp.ClientSession with a pooled TCP connector
+    """
+    global _http_session, _http_session_loop
+
+    session = _http_session
+    loop = asyncio.get_running_loop()
+    if session is not None and not session.closed and _http_session_loop is loop:
+        return session
+
+    connector = aiohttp.TCPConnector(
+        resolver=_get_resolver(),
+        limit=50,
+        limit_per_host=20,
+        ttl_dns_cache=600,
+        keepalive_timeout=60,
+    )
+    session = aiohttp.ClientSession(timeout=HTTP_TIMEOUT, connector=connector)
+    _http_session = session
+    _http_session_loop = loop
+    return session
+
+async def close_http_session() -> None:
+    """Close the shared aiohttp session. Intended to be called once on shutdown."""
+    global _http_session, _http_session_loop
+
+    session = _http_session
+    _http_session = None
+    _http_session_loop = None
+    if session is not None and not session.closed:
+        await session.close()
+
+# Retry policy for transient API failures. Four attempts of 15 seconds each plus
+# three backoff sleeps bound a request at about 64 seconds with jittered backoff
+# (at most 0.5 + 1 + 2 seconds of sleep), or 84 seconds if every retry honors a
+# Retry-After capped at RETRY_MAX_DELAY
+RETRY_ATTEMPTS = 4
+RETRY_INITIAL_DELAY = 0.5  # seconds
+RETRY_MAX_DELAY = 8.0  # seconds
+RETRY_ATTEMPT_TIMEOUT = REQUEST_TIMEOUT
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+def _get_retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Compute the wait before the next attempt.
+
+    Honors a numeric Retry-After header when present, otherwise uses
+    exponential backoff with full jitter. Both are capped at RETRY_MAX_DELAY.
+    """
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), RETRY_MAX_DELAY)
+        except ValueError:
+            pass
+    return random.uniform(0, min(RETRY_INITIAL_DELAY * 2 ** attempt, RETRY_MAX_DELAY))
+
+async def request_with_retry(
+    request: Callable[..., Any],
+    url: str,
+    retry_statuses: frozenset = RETRY_STATUSES,
+    **kwargs
+) -> Tuple[int, bytes]:
+    """Send an HTTP request, retrying transient failures with backoff and jitter.
+
+    Connection errors, timeouts, and responses with a status in retry_statuses
+    are retried up to RETRY_ATTEMPTS times, each attempt limited to 15 seconds.
+
+    Args:
+        request: Bound session method to call (e.g. session.get or session.post)
+        url: Request URL
+        retry_statuses: Response statuses that should be retried
+        **kwargs: Extra arguments passed through to the request
+
+    Returns:
+        Tuple of the final response status and body bytes
+
+    Raises:
+        aiohttp.ClientError or asyncio.TimeoutError if the last attempt fails
+    """
+    for attempt in range(RETRY_ATTEMPTS):
+        last_attempt = attempt == RETRY_ATTEMPTS - 1
+        retry_after = None
+        try:
+            async with request(url, timeout=RETRY_ATTEMPT_TIMEOUT, **kwargs) as response:
+                body = await response.read()
+                if response.status not in retry_statuses or last_attempt:
+                    return response.status, body
+                retry_after = response.headers.get("Retry-After")
+                logging.warning("Request to %s returned status %s, retrying", url, response.status)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if last_attempt:
+                raise
+            logging.warning("Request to %s failed with %s, retrying", url, type(e).__name__)
+
+        await asyncio.sleep(_get_retry_delay(attempt, retry_after))
+
+def format_api_error(
+    api_name: str,
+    status: int,
+    body: bytes,
+    messages: Optional[Dict[int, str]] = None
+) -> str:
+    """Format the error string a tool returns for a non-200 API response.
+
+    Args:
+        api_name: Prefix for the message (e.g. "Web Risk API")
+        status: HTTP status of the response
+        body: Raw response body
+        messages: Messages for statuses the API documents; a "{body}"
+            placeholder is replaced with the response text
+
+    Returns:
+        The status-specific message, or a generic one including the response text
+    """
+    message = messages.get(status) if messages else None
+    if message is None:
+        message = f"Received status {status}. {{body}}"
+    if "{body}" in message:
+        message = message.replace("{body}", body.decode("utf-8", "replace"))
+    return f"{api_name} Error: {message}"
+
 ##########################
 # Model Provider Native Websearch Utils
 ##########################
@@ -679,6 +850,14 @@ def get_config_value(value):
     else:
         return value.value
 
+def drop_none_values(value):
+    """Return a copy of dumped model data without None-valued keys, like exclude_none."""
+    if isinstance(value, dict):
+        return {key: drop_none_values(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        return [drop_none_values(item) for item in value]
+    return value
+
 def get_api_key_for_model(model_name: str, config: RunnableConfig):
     """Get API key for a specific model from environment or config."""
     should_get_from_config = os.getenv("GET_API_KEYS_FROM_CONFIG", "false")
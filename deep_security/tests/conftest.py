@@ -2,7 +2,52 @@
 
 import sys
 from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
 
 # Add src directory to Python path for imports
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
+
+
+@pytest.fixture(autouse=True)
+def reset_http_session(monkeypatch):
+    """Make each test build its own shared HTTP session."""
+    from open_deep_research import utils
+
+    monkeypatch.setattr(utils, "_http_session", None)
+
+
+@pytest_asyncio.fixture
+async def close_shared_session():
+    """Close the real shared session a test opens on its own event loop."""
+    from open_deep_research import utils
+
+    yield
+    await utils.close_http_session()
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    """Retry failed requests immediately instead of backing off."""
+    from open_deep_research import utils
+
+    monkeypatch.setattr(utils, "RETRY_INITIAL_DELAY", 0.0)
+
+
+
+@pytest.fixture
+def tool_cache(request, monkeypatch):
+    """Keep Firestore out of a tool's tests: every lookup misses and writes are recorded.
+
+    Parametrize indirectly with the tool module whose cache helpers are stubbed.
+    """
+    cache = {
+        "get": AsyncMock(return_value=None),
+        "save": MagicMock(),
+    }
+    monkeypatch.setattr(request.param, "get_cached_document", cache["get"])
+    monkeypatch.setattr(request.param, "save_cached_document_async", cache["save"])
+    return cache
@@ -0,0 +1,208 @@
+"""Tests for the NVD CVE search tool."""
+
+import asyncio
+import re
+
+import pytest
+from aioresponses import aioresponses
+
+from open_deep_research.tools import cve_search, cve_tool
+
+# Searches are sent with the keywords as query parameters
+NVD_URL_PATTERN = re.compile(rf"^{re.escape(cve_tool.NVD_CVE_API_URL)}\?")
+
+# Close the real shared session and stub the Firestore cache helpers for every test
+pytestmark = [
+    pytest.mark.usefixtures("close_shared_session", "tool_cache"),
+    pytest.mark.parametrize("tool_cache", [cve_tool], indirect=True),
+]
+
+
+def keyword_url(keyword_search):
+    """Match the NVD search request for one keywordSearch value."""
+    encoded = re.escape(keyword_search).replace(r"\ ", r"(?:\+|%20)")
+    return re.compile(rf"^{re.escape(cve_tool.NVD_CVE_API_URL)}\?keywordSearch={encoded}&")
+
+
+def sent_params(mocked):
+    """Return the query parameters of every request sent, in order."""
+    return [call.kwargs["params"] for calls in mocked.requests.values() for call in calls]
+
+
+def make_vulnerability(cve_id, published, score=7.5, severity="HIGH"):
+    """Build a minimal NVD vulnerability entry."""
+    return {
+        "cve": {
+            "id": cve_id,
+            "published": published,
+            "lastModified": published,
+            "descriptions": [{"lang": "en", "value": f"Description of {cve_id}"}],
+            "metrics": {
+                "cvssMetricV31": [{"cvssData": {"baseScore": score, "baseSeverity": severity}}]
+            },
+            "references": [{"url": f"https://nvd.nist.gov/vuln/detail/{cve_id}"}]
+        }
+    }
+
+
+@pytest.mark.asyncio
+async def test_cve_search_single_keyword():
+    """Test a single-keyword search and its formatted output."""
+    mock_response_data = {
+        "totalResults": 1,
+        "vulnerabilities": [make_vulnerability("CVE-2021-44228", "2021-12-10T10:15:09.143")]
+    }
+
+    with aioresponses() as mocked:
+        mocked.get(NVD_URL_PATTERN, status=200, payload=mock_response_data)
+        result = await cve_search.ainvoke({"keywords": ["log4j"]})
+
+    assert "CVE Search Results for 'log4j'" in result
+    assert "--- CVE-2021-44228 ---" in result
+    assert "CVSS Score: 7.5 (HIGH)" in result
+    assert sent_params(mocked)[0]["keywordSearch"] == "log4j"
+
+
+@pytest.mark.asyncio
+async def test_cve_search_multiple_keywords_and_query():
+    """Test that multiple keywords are searched together when records match all of them."""
+    mock_response_data = {
+        "totalResults": 1,
+        "vulnerabilities": [make_vulnerability("CVE-2021-44228", "2021-12-10T10:15:09.143")]
+    }
+
+    with aioresponses() as mocked:
+        mocked.get(keyword_url("apache log4j"), status=200, payload=mock_response_data)
+        result = await cve_search.ainvoke({"keywords": ["apache", "log4j"]})
+
+    # One combined request, no per-keyword fallback
+    assert [params["keywordSearch"] for params in sent_params(mocked)] == ["apache log4j"]
+    assert "--- CVE-2021-44228 ---" in result
+
+
+@pytest.mark.asyncio
+async def test_cve_search_multiple_keywords_merged():
+    """Test that a combined search with no hits falls back to per-keyword searches deduped by CVE id."""
+    responses = {
+        "apache": {
+            "totalResults": 2,
+            "vulnerabilities": [
+                make_vulnerability("CVE-2021-44228", "2021-12-10T10:15:09.143"),
+                make_vulnerability("CVE-2020-0001", "2020-01-01T00:00:00.000"),
+            ]
+        },
+        "log4j": {
+            "totalResults": 2,
+            "vulnerabilities": [
+                make_vulnerability("CVE-2021-44228", "2021-12-10T10:15:09.143"),
+                make_vulnerability("CVE-2022-0002", "2022-02-02T00:00:00.000"),
+            ]
+        },
+    }
+
+    with aioresponses() as mocked:
+        mocked.get(keyword_url("apache log4j"), status=200, payload={"totalResults": 0, "vulnerabilities": []})
+        for keyword, response_data in responses.items():
+            mocked.get(keyword_url(keyword), status=200, payload=response_data)
+        result = await cve_search.ainvoke({"keywords": ["apache", "log4j"]})
+
+    # The combined request, then one request per keyword, duplicates merged, newest first
+    assert len(sent_params(mocked)) == 3
+    assert result.count("--- CVE-2021-44228 ---") == 1
+    assert result.index("CVE-2022-0002") < result.index("CVE-2021-44228") < result.index("CVE-2020-0001")
+
+
+@pytest.mark.asyncio
+async def test_cve_search_partial_failure_not_cached(tool_cache):
+    """Test that a failed per-keyword search is reported and the partial merge is not cached."""
+    apache_data = {
+        "totalResults": 1,
+        "vulnerabilities": [make_vulnerability("CVE-2021-44228", "2021-12-10T10:15:09.143")]
+    }
+
+    with aioresponses() as mocked:
+        mocked.get(keyword_url("apache log4j"), status=200, payload={"totalResults": 0, "vulnerabilities": []})
+        mocked.get(keyword_url("apache"), status=200, payload=apache_data)
+        mocked.get(keyword_url("log4j"), status=403, payload={}, repeat=True)
+        result = await cve_search.ainvoke({"keywords": ["apache", "log4j"]})
+
+    assert "--- CVE-2021-44228 ---" in result
+    assert "searches for these keywords failed and are not included: log4j" in result
+    tool_cache["save"].assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cve_search_rate_limited():
+    """Test the rate limit error message."""
+    with aioresponses() as mocked:
+        mocked.get(NVD_URL_PATTERN, status=403, payload={}, repeat=True)
+        result = await cve_search.ainvoke({"keywords": ["apache", "log4j"]})
+
+    assert "CVE API Error: Rate limit exceeded" in result
+
+
+@pytest.mark.asyncio
+async def test_cve_search_cache_hit(tool_cache):
+    """Test that a cached result is returned without calling NVD."""
+    tool_cache["get"].return_value = {"formatted": "cached CVE report"}
+
+    with aioresponses() as mocked:
+        result = await cve_search.ainvoke({"keywords": ["log4j"]})
+
+    assert result == "cached CVE report"
+    assert not mocked.requests
+    tool_cache["save"].assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cve_search_writes_through_to_cache(tool_cache):
+    """Test that a fresh result is saved under an order-insensitive key."""
+    mock_response_data = {
+        "totalResults": 1,
+        "vulnerabilities": [make_vulnerability("CVE-2021-44228", "2021-12-10T10:15:09.143")]
+    }
+
+    with aioresponses() as mocked:
+        mocked.get(NVD_URL_PATTERN, status=200, payload=mock_response_data, repeat=True)
+        result = await cve_search.ainvoke({"keywords": ["Log4j", "apache"]})
+
+    collection, key, data = tool_cache["save"].call_args[0]
+    assert collection == "cve_cache"
+    assert key == cve_tool._cve_cache_key(["apache", "log4j"], 20)
+    assert data["formatted"] == result
+
+
+@pytest.mark.asyncio
+async def test_cve_search_retries_transient_errors():
+    """Test that a 503 from NVD is retried before succeeding."""
+    mock_response_data = {
+        "totalResults": 1,
+        "vulnerabilities": [make_vulnerability("CVE-2021-44228", "2021-12-10T10:15:09.143")]
+    }
+
+    with aioresponses() as mocked:
+        mocked.get(NVD_URL_PATTERN, status=503)
+        mocked.get(NVD_URL_PATTERN, status=200, payload=mock_response_data)
+        result = await cve_search.ainvoke({"keywords": ["log4j"]})
+
+    assert len(sent_params(mocked)) == 2
+    assert "--- CVE-2021-44228 ---" in result
+
+
+@pytest.mark.asyncio
+async def test_cve_search_timeout():
+    """Test timeout handling."""
+    with aioresponses() as mocked:
+        mocked.get(NVD_URL_PATTERN, exception=asyncio.TimeoutError(), repeat=True)
+        result = await cve_search.ainvoke({"keywords": ["log4j"]})
+
+    assert "CVE API Error: Request timed out" in result
+
+
+@pytest.mark.asyncio
+async def test_cve_search_shares_nvd_semaphore():
+    """Test that searches on one event loop share the NVD concurrency limit."""
+    semaphore = cve_tool._get_nvd_semaphore()
+
+    assert cve_tool._get_nvd_semaphore() is semaphore
+    assert semaphore._value == cve_tool.NVD_MAX_CONCURRENT_REQUESTS
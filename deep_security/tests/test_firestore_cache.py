@@ -0,0 +1,191 @@
+"""Tests for the Firestore report and tool result cache."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+
+from open_deep_research import firestore_cache
+
+
+@pytest.fixture(autouse=True)
+def reset_firestore_state(monkeypatch):
+    """Give every test a fresh client, write queue, and set of local caches."""
+    monkeypatch.setattr(firestore_cache, "_db", None)
+    monkeypatch.setattr(firestore_cache, "_firebase_unavailable", False)
+    monkeypatch.setattr(firestore_cache, "_initialization_lock", None)
+    monkeypatch.setattr(firestore_cache, "_warmup_task", None)
+    monkeypatch.setattr(firestore_cache, "_write_queue", None)
+    monkeypatch.setattr(firestore_cache, "_writer_task", None)
+    monkeypatch.setattr(firestore_cache, "_pending_saves", set())
+    monkeypatch.setattr(firestore_cache, "_READ_CACHE", firestore_cache._TTLCache(ttl=60.0, maxsize=1024))
+    monkeypatch.setattr(firestore_cache, "_DOCUMENT_CACHES", {})
+
+
+@pytest.fixture
+def no_firebase(monkeypatch):
+    """Make Firebase initialization fail as it does without credentials, counting attempts."""
+    init = MagicMock(return_value=None)
+    monkeypatch.setattr(firestore_cache, "_initialize_firebase_sync", init)
+    return init
+
+
+@pytest_asyncio.fixture
+async def fake_db(monkeypatch):
+    """Install a mocked Firestore client that records each batch it creates."""
+    db = MagicMock()
+    db.batches = []
+
+    def new_batch():
+        batch = MagicMock()
+        db.batches.append(batch)
+        return batch
+
+    db.batch.side_effect = new_batch
+    # No report is cached yet unless a test says otherwise
+    db.collection.return_value.document.return_value.get.return_value.exists = False
+    monkeypatch.setattr(firestore_cache, "_db", db)
+    yield db
+    if firestore_cache._writer_task is not None:
+        firestore_cache._writer_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_failed_initialization_is_remembered(no_firebase):
+    """Test that Firebase setup is attempted once when credentials are missing."""
+    for _ in range(3):
+        assert await firestore_cache.get_cached_document("cve_cache", "log4j", 60) is None
+    assert await firestore_cache.save_cached_document("cve_cache", "log4j", {"formatted": "x"}) is False
+
+    assert no_firebase.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_tool_results_cached_locally_without_firebase(no_firebase):
+    """Test that a written tool result is served from the in-process cache without Firestore."""
+    assert await firestore_cache.get_cached_document("cve_cache", "Log4j", 60) is None
+    await firestore_cache.save_cached_document("cve_cache", "Log4j", {"formatted": "cached"})
+
+    cached = await firestore_cache.get_cached_document("cve_cache", "log4j", 60)
+
+    assert cached["formatted"] == "cached"
+
+
+@pytest.mark.asyncio
+async def test_document_cache_created_once_per_collection(no_firebase):
+    """Test that lookups reuse one local cache per collection and honor each caller's max_age."""
+    await firestore_cache.get_cached_document("cve_cache", "log4j", 3600)
+    local_cache = firestore_cache._DOCUMENT_CACHES["cve_cache"]
+    local_cache.set("log4j", {"formatted": "old", "cached_at": "2000-01-01T00:00:00Z"})
+
+    assert await firestore_cache.get_cached_document("cve_cache", "log4j", 60) is None
+    assert firestore_cache._DOCUMENT_CACHES["cve_cache"] is local_cache
+
+
+@pytest.mark.asyncio
+async def test_writes_split_into_batches(fake_db):
+    """Test that concurrent writes are committed in batches of at most _WRITE_BATCH_SIZE."""
+    doc_refs = [MagicMock() for _ in range(firestore_cache._WRITE_BATCH_SIZE + 1)]
+
+    await asyncio.gather(*(firestore_cache._write(doc_ref, {"n": i}) for i, doc_ref in enumerate(doc_refs)))
+
+    assert [batch.set.call_count for batch in fake_db.batches] == [firestore_cache._WRITE_BATCH_SIZE, 1]
+    assert all(batch.commit.call_count == 1 for batch in fake_db.batches)
+
+
+@pytest.mark.asyncio
+async def test_commit_failure_reaches_every_write(fake_db):
+    """Test that a failed batch commit is raised to every write in the batch."""
+    fake_db.batch.side_effect = None
+    fake_db.batch.return_value.commit.side_effect = RuntimeError("commit failed")
+
+    results = await asyncio.gather(
+        *(firestore_cache._write(MagicMock(), {"n": i}) for i in range(3)),
+        return_exceptions=True,
+    )
+
+    assert [str(result) for result in results] == ["commit failed"] * 3
+
+
+@pytest.mark.asyncio
+async def test_identical_report_only_refreshes_timestamp(fake_db):
+    """Test that re-saving an unchanged report writes only cached_at, merged into the document."""
+    report = {"summary": "ok", "score": 7}
+
+    assert await firestore_cache.save_to_cache("Slack", report) is True
+    assert await firestore_cache.save_to_cache("slack", dict(reversed(report.items()))) is True
+
+    first, second = (batch.set.call_args for batch in fake_db.batches)
+    assert first.args[1]["report"] == report
+    assert first.kwargs == {"merge": False}
+    assert list(second.args[1]) == ["cached_at"]
+    assert second.kwargs == {"merge": True}
+
+
+def test_doc_id_hashes_invalid_ids():
+    """Test that plain queries are kept and IDs Firestore would reject are hashed."""
+    long_query = "x" * 600
+
+    assert firestore_cache._doc_id("  Slack ") == "slack"
+    for query in ("owner/repo", long_query, "..", "__name__", ""):
+        doc_id = firestore_cache._doc_id(query)
+        assert len(doc_id) == 40 and "/" not in doc_id
+    assert firestore_cache._doc_id("Owner/Repo") == firestore_cache._doc_id("owner/repo")
+
+
+def test_ttl_cache_expiry_and_eviction():
+    """Test that entries expire after the TTL and the least recently used entry is evicted."""
+    cache = firestore_cache._TTLCache(ttl=60.0, maxsize=2)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    # Reading a makes b the least recently used entry
+    assert cache.get("a") == {"v": 1}
+    cache.set("c", {"v": 3})
+
+    assert cache.get("b") is None
+    assert list(cache._entries) == ["a", "c"]
+
+    expired = firestore_cache._TTLCache(ttl=0.0, maxsize=2)
+    expired.set("a", {"v": 1})
+    assert expired.get("a") is None
+    assert not expired._entries
+
+
+@pytest.mark.asyncio
+async def test_drain_pending_waits_for_background_saves(fake_db):
+    """Test that drain_pending() returns once background saves have been committed."""
+    tasks = [
+        firestore_cache.save_to_cache_async("slack", {"summary": "ok"}),
+        firestore_cache.save_cached_document_async("cve_cache", "log4j", {"formatted": "x"}),
+    ]
+
+    await firestore_cache.drain_pending()
+
+    assert [task.result() for task in tasks] == [True, True]
+    assert not firestore_cache._pending_saves
+
+
+@pytest.mark.asyncio
+async def test_drain_pending_gives_up_after_timeout():
+    """Test that drain_pending() stops waiting for a save that does not finish in time."""
+    task = firestore_cache._track_pending(asyncio.sleep(60))
+
+    await firestore_cache.drain_pending(timeout=0.01)
+
+    assert not task.done()
+    task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_close_firestore_flushes_write_queue(fake_db):
+    """Test that close_firestore() commits queued writes before closing the client."""
+    task = firestore_cache.save_cached_document_async("cve_cache", "log4j", {"formatted": "x"})
+
+    await firestore_cache.close_firestore()
+
+    assert task.result() is True
+    fake_db.batches[0].commit.assert_called_once()
+    fake_db.close.assert_called_once()
+    assert firestore_cache._db is None
+    assert firestore_cache._writer_task is None
@@ -1,13 +1,24 @@
 """Tests for the Mozilla Observatory API tool."""
 
 import asyncio
-import json
-from unittest.mock import AsyncMock, MagicMock, patch
+import re
 
 import pytest
-from aiohttp import ClientTimeout
+from aioresponses import aioresponses
+from yarl import URL
 
-from open_deep_research.tools import observatory_scan
+from open_deep_research import utils
+from open_deep_research.tools import observatory_scan, observatory_tool
+
+SCAN_URL = "https://observatory-api.mdn.mozilla.net/api/v2/scan"
+# Scans are posted with the host as a query parameter
+SCAN_URL_PATTERN = re.compile(rf"^{re.escape(SCAN_URL)}\?host=")
+
+# Close the real shared session and stub the Firestore cache helpers for every test
+pytestmark = [
+    pytest.mark.usefixtures("close_shared_session", "tool_cache"),
+    pytest.mark.parametrize("tool_cache", [observatory_tool], indirect=True),
+]
 
 
 @pytest.mark.asyncio
@@ -28,21 +39,8 @@ async def test_observatory_scan_success():
         "tests_quantity": 10
     }
 
-    # Create mock response
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.json = AsyncMock(return_value=mock_response_data)
-    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
-    mock_response.__aexit__ = AsyncMock(return_value=None)
-
-    # Create mock session
-    mock_session = AsyncMock()
-    mock_session.post = MagicMock(return_value=mock_response)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=None)
-
-    # Patch aiohttp.ClientSession
-    with patch('aiohttp.ClientSession', return_value=mock_session):
+    with aioresponses() as mocked:
+        mocked.post(SCAN_URL_PATTERN, status=200, payload=mock_response_data)
         result = await observatory_scan.ainvoke({"domain": "example.com"})
 
     # Verify the result
@@ -64,22 +62,8 @@ async def test_observatory_scan_site_down():
         "message": "The site seems to be down."
     }
 
-    # Create mock response for non-200 status
-    mock_response = AsyncMock()
-    mock_response.status = 500
-    mock_response.json = AsyncMock(return_value=mock_error_data)
-    mock_response.text = AsyncMock(return_value=json.dumps(mock_error_data))
-    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
-    mock_response.__aexit__ = AsyncMock(return_value=None)
-
-    # Create mock session
-    mock_session = AsyncMock()
-    mock_session.post = MagicMock(return_value=mock_response)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=None)
-
-    # Patch aiohttp.ClientSession
-    with patch('aiohttp.ClientSession', return_value=mock_session):
+    with aioresponses() as mocked:
+        mocked.post(SCAN_URL_PATTERN, status=500, payload=mock_error_data)
         result = await observatory_scan.ainvoke({"domain": "mdn.net"})
 
     # Verify the error message is in the result
@@ -96,21 +80,8 @@ async def test_observatory_scan_error_in_response():
         "message": "Invalid hostname provided."
     }
 
-    # Create mock response
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.json = AsyncMock(return_value=mock_response_data)
-    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
-    mock_response.__aexit__ = AsyncMock(return_value=None)
-
-    # Create mock session
-    mock_session = AsyncMock()
-    mock_session.post = MagicMock(return_value=mock_response)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=None)
-
-    # Patch aiohttp.ClientSession
-    with patch('aiohttp.ClientSession', return_value=mock_session):
+    with aioresponses() as mocked:
+        mocked.post(SCAN_URL_PATTERN, status=200, payload=mock_response_data)
         result = await observatory_scan.ainvoke({"domain": "invalid-domain"})
 
     # Verify the error message is in the result
@@ -122,13 +93,8 @@ async def test_observatory_scan_error_in_response():
 async def test_observatory_scan_timeout():
     """Test timeout handling."""
     # Create mock session that raises timeout
-    mock_session = AsyncMock()
-    mock_session.post = MagicMock(side_effect=asyncio.TimeoutError())
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=None)
-
-    # Patch aiohttp.ClientSession
-    with patch('aiohttp.ClientSession', return_value=mock_session):
+    with aioresponses() as mocked:
+        mocked.post(SCAN_URL_PATTERN, exception=asyncio.TimeoutError(), repeat=True)
         result = await observatory_scan.ainvoke({"domain": "slow-domain.com"})
 
     # Verify timeout error message
@@ -141,13 +107,8 @@ async def test_observatory_scan_timeout():
 async def test_observatory_scan_general_exception():
     """Test handling of general exceptions."""
     # Create mock session that raises a general exception
-    mock_session = AsyncMock()
-    mock_session.post = MagicMock(side_effect=Exception("Network error"))
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=None)
-
-    # Patch aiohttp.ClientSession
-    with patch('aiohttp.ClientSession', return_value=mock_session):
+    with aioresponses() as mocked:
+        mocked.post(SCAN_URL_PATTERN, exception=Exception("Network error"), repeat=True)
         result = await observatory_scan.ainvoke({"domain": "error-domain.com"})
 
     # Verify error message
@@ -171,29 +132,15 @@ async def test_observatory_scan_api_parameters():
         "scanned_at": "2025-11-15T13:08:33.700Z"
     }
 
-    # Create mock response
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.json = AsyncMock(return_value=mock_response_data)
-    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
-    mock_response.__aexit__ = AsyncMock(return_value=None)
-
-    # Create mock session
-    mock_session = AsyncMock()
-    mock_session.post = MagicMock(return_value=mock_response)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=None)
-
-    # Patch aiohttp.ClientSession
-    with patch('aiohttp.ClientSession', return_value=mock_session):
+    with aioresponses() as mocked:
+        mocked.post(SCAN_URL_PATTERN, status=200, payload=mock_response_data)
         result = await observatory_scan.ainvoke({"domain": "mozilla.org"})
 
     # Verify the API was called with correct parameters
-    mock_session.post.assert_called_once()
-    call_args = mock_session.post.call_args
-    assert call_args[0][0] == "https://observatory-api.mdn.mozilla.net/api/v2/scan"
-    assert call_args[1]["params"]["host"] == "mozilla.org"
-    assert call_args[1]["headers"]["Content-Type"] == "application/x-www-form-urlencoded"
+    calls = mocked.requests[("POST", URL(SCAN_URL).with_query(host="mozilla.org"))]
+    assert len(calls) == 1
+    assert calls[0].kwargs["params"]["host"] == "mozilla.org"
+    assert calls[0].kwargs["headers"]["Content-Type"] == "application/x-www-form-urlencoded"
 
     # Verify successful result formatting
     assert "Grade: A+" in result
@@ -218,21 +165,8 @@ async def test_observatory_scan_response_formatting():
         "tests_quantity": 10
     }
 
-    # Create mock response
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.json = AsyncMock(return_value=mock_response_data)
-    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
-    mock_response.__aexit__ = AsyncMock(return_value=None)
-
-    # Create mock session
-    mock_session = AsyncMock()
-    mock_session.post = MagicMock(return_value=mock_response)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=None)
-
-    # Patch aiohttp.ClientSession
-    with patch('aiohttp.ClientSession', return_value=mock_session):
+    with aioresponses() as mocked:
+        mocked.post(SCAN_URL_PATTERN, status=200, payload=mock_response_data)
         result = await observatory_scan.ainvoke({"domain": "test.com"})
 
     # Verify all fields are present in output
@@ -246,3 +180,44 @@ async def test_observatory_scan_response_formatting():
     assert "Scanned At: 2025-11-15T10:30:00.000Z" in result
     assert "https://developer.mozilla.org/en-US/observatory/analyze?host=test.com" in result
     assert "For detailed per-test breakdowns" in result
+
+
+@pytest.mark.asyncio
+async def test_observatory_scan_reuses_shared_session():
+    """Test that repeated scans reuse one pooled client session."""
+    mock_response_data = {
+        "id": 1,
+        "grade": "A",
+        "score": 90,
+        "tests_failed": 1,
+        "tests_passed": 9,
+        "tests_quantity": 10,
+        "status_code": 200,
+        "details_url": "https://example.com/report",
+        "scanned_at": "2025-11-15T13:08:33.700Z"
+    }
+
+    with aioresponses() as mocked:
+        mocked.post(SCAN_URL_PATTERN, status=200, payload=mock_response_data, repeat=True)
+        await observatory_scan.ainvoke({"domain": "example.com"})
+        session = utils._http_session
+        await observatory_scan.ainvoke({"domain": "example.org"})
+
+    # Verify one session was created and used for both requests
+    assert session is not None
+    assert utils._http_session is session
+    assert sum(len(calls) for calls in mocked.requests.values()) == 2
+
+
+@pytest.mark.asyncio
+async def test_observatory_scan_cache_hit(tool_cache):
+    """Test that a recent scan of the same domain is returned without calling the API."""
+    tool_cache["get"].return_value = {"formatted": "cached scan report"}
+
+    with aioresponses() as mocked:
+        result = await observatory_scan.ainvoke({"domain": " Example.com "})
+
+    assert result == "cached scan report"
+    assert tool_cache["get"].call_args[0][:2] == ("observatory_cache", "example.com")
+    assert not mocked.requests
+    tool_cache["save"].assert_not_called()
@@ -0,0 +1,190 @@
+"""Tests for the Google Web Risk URL check tools."""
+
+import asyncio
+import re
+import time
+
+import orjson
+import pytest
+from aioresponses import CallbackResult, aioresponses
+
+from open_deep_research.tools import (
+    safe_browsing_check,
+    safe_browsing_check_batch,
+    safe_browsing_tool,
+)
+
+# Lookups are sent with the threat types, URL, and key as query parameters
+SEARCH_URL_PATTERN = re.compile(rf"^{re.escape(safe_browsing_tool.WEB_RISK_SEARCH_URL)}\?")
+
+MALWARE_THREAT = {
+    "threat": {
+        "threatTypes": ["MALWARE"],
+        "expireTime": "2099-01-01T00:00:00.123456789Z",
+    }
+}
+
+# Close the real shared session after every test
+pytestmark = pytest.mark.usefixtures("close_shared_session")
+
+
+@pytest.fixture(autouse=True)
+def web_risk_env(monkeypatch):
+    """Provide an API key and start every test with an empty verdict cache."""
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    safe_browsing_tool._VERDICT_CACHE.clear()
+    yield
+    safe_browsing_tool._VERDICT_CACHE.clear()
+
+
+def verdicts_by_uri(verdicts):
+    """Answer each lookup with the verdict for its uri parameter, clean if not listed."""
+    def callback(url, **kwargs):
+        return CallbackResult(status=200, body=orjson.dumps(verdicts.get(url.query["uri"], {})))
+    return callback
+
+
+def sent_uris(mocked):
+    """Return the uri parameter of every lookup sent."""
+    return [url.query["uri"] for (_, url), calls in mocked.requests.items() for _ in calls]
+
+
+@pytest.mark.asyncio
+async def test_safe_browsing_check_safe_url():
+    """Test that an empty response is reported as safe."""
+    with aioresponses() as mocked:
+        mocked.get(SEARCH_URL_PATTERN, status=200, body=b"{}")
+        result = await safe_browsing_check.ainvoke({"url": "https://example.com"})
+
+    assert "Web Risk Check Results for 'https://example.com'" in result
+    assert "STATUS: ✓ SAFE" in result
+
+
+@pytest.mark.asyncio
+async def test_safe_browsing_check_threat_detected():
+    """Test that a threat match is formatted with its types and expiry."""
+    with aioresponses() as mocked:
+        mocked.get(SEARCH_URL_PATTERN, status=200, payload=MALWARE_THREAT)
+        result = await safe_browsing_check.ainvoke({"url": "http://malware.test/"})
+
+    assert "STATUS: ⚠️ THREAT DETECTED" in result
+    assert "Threat Types: MALWARE" in result
+    assert "MALWARE: The URL hosts or distributes malicious software" in result
+    assert "WARNING: This URL has been flagged by Google Web Risk." in result
+
+
+@pytest.mark.asyncio
+async def test_safe_browsing_check_missing_api_key(monkeypatch):
+    """Test the error returned when no API key is configured."""
+    monkeypatch.delenv("GOOGLE_API_KEY")
+
+    with aioresponses() as mocked:
+        result = await safe_browsing_check.ainvoke({"url": "https://example.com"})
+
+    assert "GOOGLE_API_KEY not found" in result
+    assert not mocked.requests
+
+
+@pytest.mark.asyncio
+async def test_safe_browsing_check_batch_mixed_verdicts():
+    """Test that a batch checks each unique URL once and keeps the caller's order."""
+    urls = ["https://example.com", "http://malware.test/", "https://example.com"]
+
+    with aioresponses() as mocked:
+        mocked.get(SEARCH_URL_PATTERN, callback=verdicts_by_uri({"http://malware.test/": MALWARE_THREAT}), repeat=True)
+        result = await safe_browsing_check_batch.ainvoke({"urls": urls})
+
+    assert sorted(sent_uris(mocked)) == ["http://malware.test/", "https://example.com"]
+    assert result.count("Web Risk Check Results for") == 2
+    assert result.index("'https://example.com'") < result.index("'http://malware.test/'")
+    assert "STATUS: ✓ SAFE" in result
+    assert "STATUS: ⚠️ THREAT DETECTED" in result
+
+
+@pytest.mark.asyncio
+async def test_safe_browsing_check_batch_isolates_failures():
+    """Test that a failed lookup is reported without dropping the other results."""
+    def callback(url, **kwargs):
+        if url.query["uri"] == "https://slow.test":
+            raise asyncio.TimeoutError()
+        return CallbackResult(status=200, body=b"{}")
+
+    with aioresponses() as mocked:
+        mocked.get(SEARCH_URL_PATTERN, callback=callback, repeat=True)
+        result = await safe_browsing_check_batch.ainvoke({"urls": ["https://slow.test", "https://example.com"]})
+
+    assert "Web Risk API Error: Request timed out for 'https://slow.test'" in result
+    assert "Web Risk Check Results for 'https://example.com'" in result
+
+
+@pytest.mark.asyncio
+async def test_safe_browsing_check_batch_no_urls():
+    """Test the error returned for an empty batch."""
+    result = await safe_browsing_check_batch.ainvoke({"urls": []})
+
+    assert result == "Web Risk API Error: No URLs provided."
+
+
+def test_parse_expire_time_ignores_nanoseconds():
+    """Test that an expireTime with nanosecond precision is parsed to the second."""
+    ttl = safe_browsing_tool._parse_expire_time("2099-01-01T00:00:00.123456789Z")
+
+    assert ttl is not None and ttl > 0
+    assert safe_browsing_tool._parse_expire_time("2000-01-01T00:00:00.5Z") < 0
+    assert safe_browsing_tool._parse_expire_time("not a timestamp") is None
+    assert safe_browsing_tool._parse_expire_time(None) is None
+
+
+@pytest.mark.asyncio
+async def test_safe_browsing_check_serves_cached_verdict():
+    """Test that a repeated lookup is answered from the verdict cache until it expires."""
+    with aioresponses() as mocked:
+        mocked.get(SEARCH_URL_PATTERN, status=200, payload=MALWARE_THREAT, repeat=True)
+        first = await safe_browsing_check.ainvoke({"url": "http://malware.test/"})
+        second = await safe_browsing_check.ainvoke({"url": "http://malware.test/"})
+
+    assert second == first
+    assert len(sent_uris(mocked)) == 1
+
+
+def test_cache_verdict_ttls():
+    """Test that clean verdicts use the negative TTL, threats their capped expireTime."""
+    safe_browsing_tool._cache_verdict("https://example.com", None)
+    safe_browsing_tool._cache_verdict("http://malware.test/", MALWARE_THREAT["threat"])
+
+    now = time.monotonic()
+    clean_expires, _ = safe_browsing_tool._VERDICT_CACHE["https://example.com"]
+    threat_expires, threat = safe_browsing_tool._VERDICT_CACHE["http://malware.test/"]
+    assert clean_expires - now <= safe_browsing_tool._NEGATIVE_CACHE_TTL
+    assert threat_expires - now == pytest.approx(safe_browsing_tool._VERDICT_CACHE_MAX_TTL, abs=1)
+    assert threat == MALWARE_THREAT["threat"]
+
+
+def test_cache_verdict_skips_expired_threat():
+    """Test that a threat whose expireTime has passed is not cached."""
+    expired = {"threatTypes": ["MALWARE"], "expireTime": "2000-01-01T00:00:00Z"}
+
+    safe_browsing_tool._cache_verdict("http://malware.test/", expired)
+
+    assert "http://malware.test/" not in safe_browsing_tool._VERDICT_CACHE
+
+
+def test_get_cached_verdict_evicts_expired_entry():
+    """Test that an expired entry is a miss and is removed."""
+    safe_browsing_tool._VERDICT_CACHE["https://example.com"] = (time.monotonic() - 1, None)
+
+    assert safe_browsing_tool._get_cached_verdict("https://example.com") == (False, None)
+    assert "https://example.com" not in safe_browsing_tool._VERDICT_CACHE
+
+
+def test_cache_verdict_evicts_least_recently_used(monkeypatch):
+    """Test that the cache drops its least recently used verdict when full."""
+    monkeypatch.setattr(safe_browsing_tool, "_VERDICT_CACHE_SIZE", 2)
+
+    safe_browsing_tool._cache_verdict("https://a.test", None)
+    safe_browsing_tool._cache_verdict("https://b.test", None)
+    # Reading a.test makes b.test the least recently used entry
+    assert safe_browsing_tool._get_cached_verdict("https://a.test") == (True, None)
+    safe_browsing_tool._cache_verdict("https://c.test", None)
+
+    assert list(safe_browsing_tool._VERDICT_CACHE) == ["https://a.test", "https://c.test"]
@@ -0,0 +1,103 @@
+"""Tests for the composite threat scan tool."""
+
+import asyncio
+import re
+
+import pytest
+from aioresponses import aioresponses
+
+from open_deep_research.tools import (
+    full_threat_scan,
+    safe_browsing_tool,
+    virustotal_tool,
+)
+
+FILE_HASH = "44d88612fea8a8f36de82e1278abb02f"
+SEARCH_URL_PATTERN = re.compile(rf"^{re.escape(safe_browsing_tool.WEB_RISK_SEARCH_URL)}\?")
+FILES_URL_PATTERN = re.compile(r"^https://www\.virustotal\.com/api/v3/files/")
+
+FILE_OBJECT = {
+    "data": {
+        "attributes": {
+            "meaningful_name": "eicar.com",
+            "md5": FILE_HASH,
+            "last_analysis_stats": {"malicious": 1, "suspicious": 0, "undetected": 5, "harmless": 0},
+        }
+    }
+}
+
+# Close the real shared session and stub the VirusTotal cache helpers for every test
+pytestmark = [
+    pytest.mark.usefixtures("close_shared_session", "tool_cache"),
+    pytest.mark.parametrize("tool_cache", [virustotal_tool], indirect=True),
+]
+
+
+@pytest.fixture(autouse=True)
+def threat_scan_env(monkeypatch):
+    """Provide both API keys and start every test with an empty Web Risk verdict cache."""
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("VIRUSTOTAL_API_KEY", "test-key")
+    safe_browsing_tool._VERDICT_CACHE.clear()
+    yield
+    safe_browsing_tool._VERDICT_CACHE.clear()
+
+
+@pytest.mark.asyncio
+async def test_full_threat_scan_url_and_hash():
+    """Test that both lookups run and are merged Web Risk first."""
+    with aioresponses() as mocked:
+        mocked.get(SEARCH_URL_PATTERN, status=200, body=b"{}")
+        mocked.get(FILES_URL_PATTERN, status=200, payload=FILE_OBJECT)
+        result = await full_threat_scan.ainvoke({"url": "https://example.com", "file_hash": FILE_HASH})
+
+    assert len(mocked.requests) == 2
+    assert "Web Risk Check Results for 'https://example.com'" in result
+    assert "VirusTotal Analysis Report for 'eicar.com'" in result
+    assert result.index("Web Risk Check Results") < result.index("VirusTotal Analysis Report")
+
+
+@pytest.mark.asyncio
+async def test_full_threat_scan_url_only():
+    """Test that only the Web Risk lookup runs when no hash is given."""
+    with aioresponses() as mocked:
+        mocked.get(SEARCH_URL_PATTERN, status=200, body=b"{}")
+        result = await full_threat_scan.ainvoke({"url": "https://example.com"})
+
+    assert len(mocked.requests) == 1
+    assert "STATUS: ✓ SAFE" in result
+    assert "VirusTotal" not in result
+
+
+@pytest.mark.asyncio
+async def test_full_threat_scan_isolates_failures():
+    """Test that a timed out lookup is reported without dropping the other result."""
+    with aioresponses() as mocked:
+        mocked.get(SEARCH_URL_PATTERN, exception=asyncio.TimeoutError())
+        mocked.get(FILES_URL_PATTERN, status=200, payload=FILE_OBJECT)
+        result = await full_threat_scan.ainvoke({"url": "https://slow.test", "file_hash": FILE_HASH})
+
+    assert "Web Risk API Error: Request timed out" in result
+    assert "Risk Level: ⚠️ HIGH RISK" in result
+
+
+@pytest.mark.asyncio
+async def test_full_threat_scan_missing_api_key(monkeypatch):
+    """Test that a missing key skips only the lookup that needs it."""
+    monkeypatch.delenv("VIRUSTOTAL_API_KEY")
+
+    with aioresponses() as mocked:
+        mocked.get(SEARCH_URL_PATTERN, status=200, body=b"{}")
+        result = await full_threat_scan.ainvoke({"url": "https://example.com", "file_hash": FILE_HASH})
+
+    assert len(mocked.requests) == 1
+    assert "STATUS: ✓ SAFE" in result
+    assert "VirusTotal API Error: VIRUSTOTAL_API_KEY not found" in result
+
+
+@pytest.mark.asyncio
+async def test_full_threat_scan_requires_input():
+    """Test the error returned when neither a url nor a hash is given."""
+    result = await full_threat_scan.ainvoke({})
+
+    assert result == "Threat Scan Error: Provide a url, a file_hash, or both."
@@ -0,0 +1,49 @@
+"""Tests for the tool package helpers."""
+
+import asyncio
+
+import pytest
+from langchain_core.tools import tool
+
+from open_deep_research import tools
+
+running = 0
+peak = 0
+
+
+@tool
+async def slow_tool(value: int) -> int:
+    """Record how many calls run at once, then return value."""
+    global running, peak
+    running += 1
+    peak = max(peak, running)
+    await asyncio.sleep(0.01)
+    running -= 1
+    return value
+
+
+@tool
+async def failing_tool(value: int) -> int:
+    """Raise for every call."""
+    raise ValueError(f"bad value {value}")
+
+
+@pytest.mark.asyncio
+async def test_run_tools_parallel_bounds_concurrent_callers():
+    """Test that the concurrency limit is shared by concurrent batches, as from several researchers."""
+    global peak
+    peak = 0
+    batches = [[(slow_tool, {"value": i}) for i in range(4)] for _ in range(3)]
+
+    results = await asyncio.gather(*(tools.run_tools_parallel(batch, {}) for batch in batches))
+
+    assert results == [[0, 1, 2, 3]] * 3
+    assert peak == tools.TOOL_CONCURRENCY_LIMIT
+
+
+@pytest.mark.asyncio
+async def test_run_tools_parallel_returns_errors_in_order():
+    """Test that a failing tool becomes an error string without cancelling the others."""
+    results = await tools.run_tools_parallel([(failing_tool, {"value": 1}), (slow_tool, {"value": 2})], {})
+
+    assert results == ["Error executing tool: bad value 1", 2]
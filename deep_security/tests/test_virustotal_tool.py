@@ -0,0 +1,169 @@
+"""Tests for the VirusTotal file analysis tools."""
+
+import asyncio
+import re
+from unittest.mock import MagicMock
+
+import orjson
+import pytest
+from aioresponses import aioresponses
+
+from open_deep_research import firestore_cache
+from open_deep_research.tools import (
+    virustotal_scan,
+    virustotal_scan_raw,
+    virustotal_tool,
+)
+
+FILE_HASH = "44d88612fea8a8f36de82e1278abb02f"
+FILES_URL_PATTERN = re.compile(r"^https://www\.virustotal\.com/api/v3/files/")
+
+# Close the real shared session and stub the Firestore cache helpers for every test
+pytestmark = [
+    pytest.mark.usefixtures("close_shared_session", "tool_cache"),
+    pytest.mark.parametrize("tool_cache", [virustotal_tool], indirect=True),
+]
+
+
+@pytest.fixture(autouse=True)
+def virustotal_api_key(monkeypatch):
+    """Provide a VirusTotal API key through the environment."""
+    monkeypatch.setenv("VIRUSTOTAL_API_KEY", "test-key")
+
+
+def make_file_object(malicious=2, detections=12):
+    """Build a minimal VirusTotal file object response."""
+    results = {
+        f"Engine{i}": {"category": "malicious", "result": f"Trojan.Test.{i}"}
+        for i in range(detections)
+    }
+    results["CleanEngine"] = {"category": "undetected", "result": None}
+    return {
+        "data": {
+            "attributes": {
+                "meaningful_name": "eicar.com",
+                "sha256": "275a021bbfb6489e54d471899f7db9d1663fc695ec2fe2a2c4538aabf651fd0f",
+                "sha1": "3395856ce81f2b7382dee72602f798b642f14140",
+                "md5": FILE_HASH,
+                "size": 68,
+                "type_description": "Text",
+                "magic": "ASCII text",
+                "tags": ["text"],
+                "last_analysis_stats": {"malicious": malicious, "suspicious": 0, "undetected": 5, "harmless": 0},
+                "signature_info": {"verified": "Signed", "product": "Test Product", "signers": "Test Signer"},
+                "last_analysis_results": results,
+            }
+        }
+    }
+
+
+@pytest.mark.asyncio
+async def test_virustotal_scan_formats_report():
+    """Test that the report lists file details, risk level, and the first detections."""
+    with aioresponses() as mocked:
+        mocked.get(FILES_URL_PATTERN, status=200, payload=make_file_object())
+        result = await virustotal_scan.ainvoke({"file_hash": FILE_HASH})
+
+    assert "VirusTotal Analysis Report for 'eicar.com'" in result
+    assert f"MD5: {FILE_HASH}" in result
+    assert "Total Engines Scanned: 7" in result
+    assert "Risk Level: ⚠️ HIGH RISK" in result
+    assert "Signer: Test Product" in result
+    assert f"{virustotal_tool.MAX_DETECTIONS_SHOWN}. Engine9: Trojan.Test.9" in result
+    assert "... and 2 more detections" in result
+
+    calls = next(iter(mocked.requests.values()))
+    assert calls[0].kwargs["headers"]["x-apikey"] == "test-key"
+
+
+@pytest.mark.asyncio
+async def test_virustotal_scan_not_found():
+    """Test the message for a hash VirusTotal has never seen."""
+    with aioresponses() as mocked:
+        mocked.get(FILES_URL_PATTERN, status=404, payload={"error": {"code": "NotFoundError"}})
+        result = await virustotal_scan.ainvoke({"file_hash": FILE_HASH})
+
+    assert f"File with hash '{FILE_HASH}' not found" in result
+
+
+@pytest.mark.asyncio
+async def test_virustotal_scan_rate_limited():
+    """Test the rate limit error message."""
+    with aioresponses() as mocked:
+        mocked.get(FILES_URL_PATTERN, status=403, payload={})
+        result = await virustotal_scan.ainvoke({"file_hash": FILE_HASH})
+
+    assert "VirusTotal API Error: Rate limit exceeded or unauthorized" in result
+
+
+@pytest.mark.asyncio
+async def test_virustotal_scan_timeout():
+    """Test timeout handling."""
+    with aioresponses() as mocked:
+        mocked.get(FILES_URL_PATTERN, exception=asyncio.TimeoutError())
+        result = await virustotal_scan.ainvoke({"file_hash": FILE_HASH})
+
+    assert "VirusTotal API Error: Request timed out" in result
+
+
+@pytest.mark.asyncio
+async def test_virustotal_scan_raw_returns_json():
+    """Test that the raw tool returns the report fields, including computed ones, as JSON."""
+    with aioresponses() as mocked:
+        mocked.get(FILES_URL_PATTERN, status=200, payload=make_file_object(malicious=0, detections=0))
+        result = await virustotal_scan_raw.ainvoke({"file_hash": FILE_HASH})
+
+    report = orjson.loads(result)
+    assert report["md5"] == FILE_HASH
+    assert report["total_engines"] == 5
+    assert report["risk_level"] == "UNKNOWN"
+    assert report["detections"] == []
+
+
+@pytest.mark.asyncio
+async def test_virustotal_scan_writes_through_to_cache(tool_cache):
+    """Test that a fetched report is saved under the normalized hash."""
+    with aioresponses() as mocked:
+        mocked.get(FILES_URL_PATTERN, status=200, payload=make_file_object())
+        await virustotal_scan.ainvoke({"file_hash": f" {FILE_HASH.upper()} "})
+
+    collection, key, data = tool_cache["save"].call_args[0]
+    assert collection == "virustotal_cache"
+    assert key == FILE_HASH
+    assert data["report"]["risk_level"] == "HIGH RISK"
+
+
+@pytest.mark.asyncio
+async def test_virustotal_scan_cache_round_trip(tool_cache):
+    """Test that a stored model_dump() is validated back into the same report."""
+    report = virustotal_tool._parse_report(make_file_object()["data"]["attributes"])
+    tool_cache["get"].return_value = {"report": report.model_dump()}
+
+    with aioresponses() as mocked:
+        result = await virustotal_scan.ainvoke({"file_hash": FILE_HASH})
+
+    assert virustotal_tool.VirusTotalReport.model_validate(report.model_dump()) == report
+    assert result == virustotal_tool._format_report(report)
+    assert not mocked.requests
+    tool_cache["save"].assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_virustotal_scan_cached_locally_without_firebase(monkeypatch):
+    """Test that a repeated hash is served from the in-process cache when Firebase is unavailable."""
+    monkeypatch.setattr(virustotal_tool, "get_cached_document", firestore_cache.get_cached_document)
+    monkeypatch.setattr(virustotal_tool, "save_cached_document_async", firestore_cache.save_cached_document_async)
+    monkeypatch.setattr(firestore_cache, "_db", None)
+    monkeypatch.setattr(firestore_cache, "_firebase_unavailable", False)
+    monkeypatch.setattr(firestore_cache, "_initialization_lock", None)
+    monkeypatch.setattr(firestore_cache, "_DOCUMENT_CACHES", {})
+    monkeypatch.setattr(firestore_cache, "_initialize_firebase_sync", MagicMock(return_value=None))
+
+    with aioresponses() as mocked:
+        mocked.get(FILES_URL_PATTERN, status=200, payload=make_file_object(), repeat=True)
+        first = await virustotal_scan.ainvoke({"file_hash": FILE_HASH})
+        await firestore_cache.drain_pending()
+        second = await virustotal_scan.ainvoke({"file_hash": FILE_HASH})
+
+    assert second == first
+    assert sum(len(calls) for calls in mocked.requests.values()) == 1